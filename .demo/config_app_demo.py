@@ -1,40 +1,49 @@
 import streamlit as st
-import yaml
+import json
 import os
+import shlex
 import subprocess
 from datetime import datetime
 import time
 import sys
 from typing import Dict, List, Union, Optional, Any, Callable
 import argparse
+import asyncio
+import atexit
+import functools
+import importlib.util
 import tempfile
 import io
 from contextlib import redirect_stdout
 
-# 尝试导入所需组件，如果不可用则设置标志
-try:
-    from streamlit_webterm import webterm
-    has_webterm = True
-except ImportError:
-    has_webterm = False
-
-try:
-    from streamlit_ace import st_ace
-    has_ace = True
-except ImportError:
-    has_ace = False
-
-try:
-    import paramiko
-    has_paramiko = True
-except ImportError:
-    has_paramiko = False
-
-try:
-    from streamlit_terminal import terminal
-    has_terminal = True
-except ImportError:
-    has_terminal = False
+# 只探测可选组件是否可安装，不执行模块体；
+# paramiko等重依赖推迟到真正使用时才导入，减少冷启动耗时
+has_webterm = importlib.util.find_spec("streamlit_webterm") is not None
+has_ace = importlib.util.find_spec("streamlit_ace") is not None
+has_paramiko = importlib.util.find_spec("paramiko") is not None
+has_terminal = importlib.util.find_spec("streamlit_terminal") is not None
+
+_yaml = None
+_yaml_loader = None
+
+def _get_yaml():
+    """首次使用时才导入yaml，优先选用libyaml的C实现Loader"""
+    global _yaml, _yaml_loader
+    if _yaml is None:
+        import yaml
+        _yaml = yaml
+        _yaml_loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    return _yaml, _yaml_loader
+
+_paramiko = None
+
+def _get_paramiko():
+    """首次使用时才导入paramiko，避免启动时加载cryptography"""
+    global _paramiko
+    if _paramiko is None:
+        import paramiko
+        _paramiko = paramiko
+    return _paramiko
 
 st.set_page_config(page_title="四合一配置界面演示", layout="wide")
 
@@ -70,41 +79,110 @@ class PresetConfig:
         self.checkbox_options = checkbox_options
         self.input_values = input_values
 
+# 预设分片解析缓存，键为(路径, mtime)，重跑时直接命中避免重复解析
+_PRESET_CACHE: Dict[tuple, dict] = {}
+
+@st.cache_data(show_spinner=False)
+def _parse_preset_file(preset_file: str, mtime_ns: int) -> dict:
+    """解析单个预设分片，mtime_ns参与缓存键使文件更新后自动失效"""
+    with open(preset_file, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    # 预设只是纯字符串/布尔值字典，用C实现的json解析；
+    # 首个非空白字符不是'{'时按旧版YAML文件兼容解析
+    if content.lstrip().startswith('{'):
+        return json.loads(content) or {}
+    yaml, loader = _get_yaml()
+    return yaml.load(content, Loader=loader) or {}
+
+def _preset_dir() -> str:
+    """获取预设分片目录，没有则创建"""
+    if "config_dir" not in st.session_state:
+        st.session_state["config_dir"] = tempfile.mkdtemp(prefix="config_app_presets_")
+    return st.session_state["config_dir"]
+
+def _preset_path(config_dir: str, name: str) -> str:
+    """单个预设分片的文件路径"""
+    safe_name = name.replace(os.sep, "_").replace("/", "_")
+    return os.path.join(config_dir, f"{safe_name}.json")
+
+def _write_preset_shard(name: str, preset: dict) -> None:
+    """原子写入单个预设分片并刷新解析缓存
+
+    每个预设独立成文件，保存/删除只动自己的分片，
+    不再每次改动都重写包含全部预设的大文件。
+    """
+    path = _preset_path(_preset_dir(), name)
+    tmp_file = path + ".tmp"
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(preset, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_file, path)
+
+    # 清掉该路径的旧缓存键，用新mtime登记
+    for key in [k for k in _PRESET_CACHE if k[0] == path]:
+        del _PRESET_CACHE[key]
+    _PRESET_CACHE[(path, os.stat(path).st_mtime_ns)] = preset
+
+def _delete_preset_shard(name: str) -> None:
+    """删除单个预设分片"""
+    path = _preset_path(_preset_dir(), name)
+    if os.path.exists(path):
+        os.remove(path)
+    for key in [k for k in _PRESET_CACHE if k[0] == path]:
+        del _PRESET_CACHE[key]
+
 # 工具函数
-def save_preset(name: str, description: str, checkbox_options: List[CheckboxOption], 
-                selected_options: List[str], input_options: List[InputOption]) -> None:
+def save_preset(name: str, description: str, checkbox_options: List[CheckboxOption],
+                selected_options: List[str], input_options: List[InputOption],
+                ss: Optional[Dict] = None) -> None:
     """保存当前配置为预设"""
     try:
+        # 优先使用调用方传入的状态快照，普通dict查找比session_state代理快
+        if ss is None:
+            ss = st.session_state
+
         # 创建新预设
         new_preset = {
             "name": name,
             "description": description,
             "checkbox_options": [opt.id for opt in checkbox_options if opt.id in selected_options],
-            "input_values": {opt.id: st.session_state.get(opt.id, "") for opt in input_options}
+            "input_values": {opt.id: ss.get(opt.id, "") for opt in input_options}
         }
 
         # 更新预设列表
         presets = st.session_state.get("presets", {})
         presets[name] = new_preset
         st.session_state["presets"] = presets
-        
-        # 保存到临时文件
-        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.yaml') as f:
-            yaml.dump({"presets": presets}, f, allow_unicode=True)
-            st.session_state["config_file"] = f.name
-        
+
+        # 只写入这一个预设的分片文件
+        _write_preset_shard(name, new_preset)
+
         st.success(f"预设 '{name}' 已保存")
-        
+
     except Exception as e:
         st.error(f"保存预设配置失败: {e}")
 
 def load_presets() -> dict:
     """加载预设配置"""
     try:
-        if "config_file" in st.session_state and os.path.exists(st.session_state["config_file"]):
-            with open(st.session_state["config_file"], 'r', encoding='utf-8') as f:
-                return yaml.safe_load(f).get('presets', {})
-        return {}
+        if "config_dir" not in st.session_state:
+            return {}
+        config_dir = st.session_state["config_dir"]
+        if not os.path.isdir(config_dir):
+            return {}
+
+        # 汇总目录下的全部分片，逐个按(路径, mtime)查缓存，
+        # 未改动的分片直接命中，只有新写入的才重新解析
+        presets = {}
+        for entry in os.scandir(config_dir):
+            if not entry.name.endswith('.json'):
+                continue
+            cache_key = (entry.path, entry.stat().st_mtime_ns)
+            if cache_key not in _PRESET_CACHE:
+                _PRESET_CACHE[cache_key] = _parse_preset_file(*cache_key)
+            preset = _PRESET_CACHE[cache_key]
+            presets[preset.get("name", entry.name[:-5])] = preset
+        return presets
     except Exception as e:
         st.error(f"加载预设配置失败: {e}")
         return {}
@@ -116,120 +194,231 @@ def apply_preset(preset_name: str, presets: dict, checkbox_options: List[Checkbo
         return
 
     preset = presets[preset_name]
-    
-    # 清空所有输入框
-    for opt in input_options:
-        if opt.id in st.session_state:
-            st.session_state[opt.id] = ""
+    ss = st.session_state
 
-    # 只设置预设中指定的值
-    for option_id, value in preset.get("input_values", {}).items():
-        st.session_state[option_id] = value
+    # 只写有差异的输入框，不再先整体清空再重建
+    target_values = preset.get("input_values", {})
+    for opt in input_options:
+        new_value = target_values.get(opt.id, "")
+        if ss.get(opt.id, "") != new_value:
+            ss[opt.id] = new_value
 
-    # 清空所有复选框选择
-    for opt in checkbox_options:
-        st.session_state[f"checkbox_{opt.id}"] = False
-    
-    # 只选择预设中指定的选项
-    for option_id in preset.get("checkbox_options", []):
-        st.session_state[f"checkbox_{option_id}"] = True
+    # 复选框取当前选中集与目标集的对称差，只翻转变化的键
+    current_selected = {opt.id for opt in checkbox_options
+                        if ss.get(f"checkbox_{opt.id}", False)}
+    target_selected = set(preset.get("checkbox_options", []))
+    for option_id in current_selected ^ target_selected:
+        ss[f"checkbox_{option_id}"] = option_id in target_selected
 
     st.success(f"已应用预设配置: {preset_name}")
 
-def update_command_preview(program: str, checkbox_options: List[CheckboxOption], 
-                          input_options: List[InputOption], extra_args: List[str] = None) -> str:
-    """更新命令预览"""
-    # 使用简化的python命令前缀
-    cmd = ["python"]
-    
-    # 添加程序路径（去掉多余的引号）
-    program_path = program.strip('"')
-    cmd.append(program_path)
+@st.cache_data(show_spinner=False)
+def _build_command(program_path: str, checked_args: tuple, input_kv: tuple, extra_args: tuple) -> tuple:
+    """按当前选项组合拼出完整命令，相同组合直接命中缓存
+
+    返回(展示用字符串, 参数列表)。参数列表供子进程直接exec，
+    展示字符串经shlex.join对含空格的值做shell安全引用。
+    """
+    cmd = ["python", program_path]
 
     # 添加选中的功能选项
-    for opt in checkbox_options:
-        if st.session_state.get(f"checkbox_{opt.id}", False):
-            cmd.append(opt.arg)
+    cmd.extend(checked_args)
 
     # 添加输入框选项
-    for opt in input_options:
-        value = st.session_state.get(opt.id, "")
-        if value:
-            cmd.extend([opt.arg, value])
+    for arg, value in input_kv:
+        cmd.extend([arg, value])
 
     # 添加额外参数
-    if extra_args:
-        cmd.extend(extra_args)
+    cmd.extend(extra_args)
+
+    return shlex.join(cmd), tuple(cmd)
+
+def update_command_preview(program: str, checkbox_options: List[CheckboxOption],
+                          input_options: List[InputOption], extra_args: List[str] = None,
+                          ss: Optional[Dict] = None) -> str:
+    """更新命令预览"""
+    # 优先使用调用方传入的状态快照，普通dict查找比session_state代理快
+    if ss is None:
+        ss = st.session_state
+
+    # (session_state键, 命令行参数)映射表每个会话只构建一次，
+    # 之后的重跑只做单次推导式扫描，不再逐选项拼接键名
+    if "_cb_keys" not in st.session_state:
+        st.session_state["_cb_keys"] = tuple((f"checkbox_{opt.id}", opt.arg) for opt in checkbox_options)
+        st.session_state["_in_keys"] = tuple((opt.id, opt.arg) for opt in input_options)
+
+    checked_args = tuple(arg for key, arg in st.session_state["_cb_keys"] if ss.get(key))
+    input_kv = tuple((arg, value) for key, arg in st.session_state["_in_keys"]
+                     if (value := ss.get(key, "")))
 
-    # 返回完整命令
-    return " ".join(cmd)
+    # 去掉程序路径上多余的引号
+    command, argv = _build_command(program.strip('"'), checked_args, input_kv, tuple(extra_args or ()))
+
+    # 参数列表另存一份，子进程执行路径直接exec而无需再过shell分词
+    st.session_state["_cmd_argv"] = list(argv)
+    return command
 
 # 执行方式实现
 def run_command_and_get_output(command):
     """使用子进程执行命令并获取输出"""
     try:
-        # 捕获命令输出
-        process = subprocess.Popen(
-            command, 
-            shell=True, 
-            stdout=subprocess.PIPE, 
-            stderr=subprocess.STDOUT,
-            text=True
-        )
-        
-        # 创建输出容器
-        output_container = st.empty()
-        
-        # 实时显示输出
-        output = ""
-        for line in process.stdout:
-            output += line
-            output_container.code(output)
-            
-        return_code = process.wait()
-        if return_code != 0:
-            st.error(f"命令执行失败，返回码: {return_code}")
-        
+        # 不经过shell直接exec，省掉一次/bin/sh fork；
+        # 优先使用命令预览时保存的参数列表，避免重新分词
+        argv = st.session_state.get("_cmd_argv") or shlex.split(command)
+        result = {"returncode": 0}
+
+        # 用asyncio子进程异步读取，等待输出时把控制权交还事件循环，
+        # 不再阻塞Streamlit的脚本线程；新行仍按50ms合并成增量推送
+        async def _stream_lines():
+            process = await asyncio.create_subprocess_exec(
+                *argv,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.STDOUT,
+                limit=1 << 20
+            )
+
+            pending: List[str] = []
+            last_flush = time.monotonic()
+            while line := await process.stdout.readline():
+                pending.append(line.decode('utf-8', errors='replace'))
+                now = time.monotonic()
+                if now - last_flush >= 0.05:
+                    yield "".join(pending)
+                    pending.clear()
+                    last_flush = now
+            if pending:
+                yield "".join(pending)
+
+            result["returncode"] = await process.wait()
+
+        output = st.write_stream(_stream_lines())
+
+        if result["returncode"] != 0:
+            st.error(f"命令执行失败，返回码: {result['returncode']}")
+
         return output
     except Exception as e:
         st.error(f"执行命令出错: {e}")
         return None
 
+# 已建立的SSH连接，按(host, port, username)复用，退出时统一关闭
+_SSH_CLIENTS: Dict[tuple, Any] = {}
+
+def _close_ssh_clients():
+    """关闭所有缓存的SSH连接"""
+    for client in _SSH_CLIENTS.values():
+        try:
+            client.close()
+        except Exception:
+            pass
+    _SSH_CLIENTS.clear()
+
+atexit.register(_close_ssh_clients)
+
+def _get_ssh_client(host, port, username, password):
+    """获取缓存的SSH连接，连接断开时自动重建
+
+    每次connect都要经历TCP+密钥交换+认证的完整往返，
+    复用已有连接可以省掉每次执行命令的几百毫秒延迟。
+    """
+    clients = st.session_state.setdefault("_ssh_clients", _SSH_CLIENTS)
+    key = (host, port, username)
+
+    client = clients.get(key)
+    transport = client.get_transport() if client else None
+    if transport is None or not transport.is_active():
+        paramiko = _get_paramiko()
+        client = paramiko.SSHClient()
+        client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        client.connect(host, port=port, username=username, password=password,
+                       compress=True, banner_timeout=10, auth_timeout=10)
+        clients[key] = client
+
+    return client
+
 def run_command_on_ssh(host, port, username, password, command):
     """通过SSH执行命令"""
     try:
         if not has_paramiko:
             st.error("未安装paramiko库，无法使用SSH功能")
             return None
-            
-        client = paramiko.SSHClient()
-        client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-        client.connect(host, port=port, username=username, password=password)
-        
-        # 创建输出容器
-        output_container = st.empty()
-        output = ""
-        
-        # 执行命令
-        stdin, stdout, stderr = client.exec_command(command)
-        
-        # 实时显示输出
-        for line in stdout:
-            output += line
-            output_container.code(output)
-            time.sleep(0.1)  # 添加小延迟以模拟实时显示
-            
-        # 显示错误
-        for line in stderr:
-            output += f"ERROR: {line}"
-            output_container.code(output)
-            
-        client.close()
+
+        # 复用缓存的连接，不在每次执行后关闭
+        client = _get_ssh_client(host, port, username, password)
+
+        # 在共享Transport上直接开会话通道执行命令，
+        # 多条命令复用同一条已认证的连接，只付通道建立的开销
+        transport = client.get_transport()
+        channel = transport.open_session()
+        channel.exec_command(command)
+        stdout = channel.makefile('r')
+        stderr = channel.makefile_stderr('r')
+
+        # 新行先攒进列表，每50ms用"".join合并成一个增量推送
+        def _stream_lines():
+            pending: List[str] = []
+            last_flush = time.monotonic()
+            for line in stdout:
+                pending.append(line)
+                now = time.monotonic()
+                if now - last_flush >= 0.05:
+                    yield "".join(pending)
+                    pending.clear()
+                    last_flush = now
+            for line in stderr:
+                pending.append(f"ERROR: {line}")
+            if pending:
+                yield "".join(pending)
+
+        output = st.write_stream(_stream_lines())
+
         return output
     except Exception as e:
         st.error(f"SSH连接或执行出错: {e}")
         return None
 
+def _parser_signature(parser: argparse.ArgumentParser) -> tuple:
+    """提取解析器动作的结构签名，作为可哈希的缓存键"""
+    return tuple(
+        (action.dest, type(action).__name__,
+         str(action.default) if action.default is not None else None,
+         tuple(action.option_strings), action.help,
+         tuple(map(str, action.choices)) if action.choices else None)
+        for action in parser._actions
+    )
+
+@functools.lru_cache(maxsize=8)
+def _derive_parser_options(signature: tuple) -> tuple:
+    """从解析器签名派生选项定义
+
+    解析器在会话期间不变，相同签名只派生一次，
+    避免每次重跑都遍历动作列表重建选项元组。
+    """
+    checkbox_options = []
+    input_options = []
+
+    for dest, action_type, default, option_strings, help_text, choices in signature:
+        # 跳过帮助选项和位置参数
+        if dest == 'help' or not option_strings:
+            continue
+
+        # 获取选项名称和帮助信息
+        opt_name = option_strings[0]  # 使用第一个选项字符串
+        help_text = help_text or ""
+        opt_id = opt_name.lstrip('-').replace('-', '_')
+
+        if action_type == '_StoreTrueAction':
+            # 布尔标志 -> 复选框
+            checkbox_options.append((help_text, opt_id, opt_name, False))
+        else:
+            # 带值的参数 -> 输入框
+            default = default or ""
+            choices_text = "/".join(choices) if choices else ""
+            placeholder = choices_text or f"默认: {default}" if default else ""
+            input_options.append((help_text, opt_id, opt_name, default, placeholder))
+
+    return tuple(checkbox_options), tuple(input_options)
+
 # 主配置界面
 def create_streamlit_config_app(
     program: str,
@@ -298,29 +487,7 @@ def create_streamlit_config_app(
     
     # 如果提供了parser并且没有提供选项，则从parser自动生成
     if parser and not (checkbox_options or input_options):
-        # 自动从parser生成选项
-        checkbox_options = []
-        input_options = []
-        
-        for action in parser._actions:
-            # 跳过帮助选项和位置参数
-            if action.dest == 'help' or not action.option_strings:
-                continue
-            
-            # 获取选项名称和帮助信息
-            opt_name = action.option_strings[0]  # 使用第一个选项字符串
-            help_text = action.help or ""
-            opt_id = opt_name.lstrip('-').replace('-', '_')
-            
-            if isinstance(action, argparse._StoreTrueAction):
-                # 布尔标志 -> 复选框
-                checkbox_options.append((help_text, opt_id, opt_name, False))
-            else:
-                # 带值的参数 -> 输入框
-                default = str(action.default) if action.default is not None else ""
-                choices = "/".join(action.choices) if action.choices else ""
-                placeholder = choices or f"默认: {default}" if default else ""
-                input_options.append((help_text, opt_id, opt_name, default, placeholder))
+        checkbox_options, input_options = _derive_parser_options(_parser_signature(parser))
 
     # 处理checkbox选项
     cb_opts = []
@@ -341,13 +508,17 @@ def create_streamlit_config_app(
             placeholder = rest[1] if len(rest) > 1 else ""
             in_opts.append(InputOption(label, id, arg, default, placeholder))
     
+    # 重跑开始时对session_state做一次快照，后续按选项读取
+    # 都走普通dict，省掉每次访问的脚本运行上下文检查
+    ss = dict(st.session_state)
+
     # 主界面分为左右两列
     left_col, right_col = st.columns([3, 1])
-    
+
     with left_col:
         # 命令预览区域
         st.subheader("命令预览")
-        command = update_command_preview(program, cb_opts, in_opts, extra_args)
+        command = update_command_preview(program, cb_opts, in_opts, extra_args, ss=ss)
         st.code(command, language="bash")
         
         # 参数设置部分
@@ -357,7 +528,7 @@ def create_streamlit_config_app(
             # 功能开关
             if cb_opts:
                 for opt in cb_opts:
-                    if f"checkbox_{opt.id}" not in st.session_state:
+                    if f"checkbox_{opt.id}" not in ss:
                         st.session_state[f"checkbox_{opt.id}"] = opt.default
                     st.checkbox(
                         opt.label, 
@@ -371,7 +542,7 @@ def create_streamlit_config_app(
             # 参数设置
             if in_opts:
                 for opt in in_opts:
-                    if opt.id not in st.session_state:
+                    if opt.id not in ss:
                         st.session_state[opt.id] = opt.default
                     st.text_input(
                         opt.label, 
@@ -396,6 +567,7 @@ def create_streamlit_config_app(
                     st.session_state['run_command'] = command
                 
                 if 'run_command' in st.session_state and st.session_state['run_command']:
+                    from streamlit_webterm import webterm
                     webterm(command=st.session_state['run_command'], key="webterm")
             else:
                 st.error("未安装streamlit-webterm组件，请使用 `pip install streamlit-webterm` 安装")
@@ -441,6 +613,7 @@ def create_streamlit_config_app(
             st.markdown("**使用Terminal组件显示交互式终端**")
             if has_terminal:
                 if st.button("使用Terminal执行", key="terminal_btn", type="primary"):
+                    from streamlit_terminal import terminal
                     st.subheader("终端执行")
                     terminal(command)
             else:
@@ -453,12 +626,13 @@ def create_streamlit_config_app(
         
         with st.expander("预设列表", expanded=True):
             if presets:
-                preset_names = list(presets.keys())
-                preset_descriptions = [f"{name} - {presets[name].get('description', '')}" for name in preset_names]
-                selected_preset = st.selectbox("选择预设", preset_descriptions, key="preset_select")
-                
+                # 描述文本到预设名的映射，免去每次重跑的线性查找
+                desc_to_name = {f"{name} - {preset.get('description', '')}": name
+                                for name, preset in presets.items()}
+                selected_preset = st.selectbox("选择预设", list(desc_to_name), key="preset_select")
+
                 if selected_preset:
-                    preset_name = preset_names[preset_descriptions.index(selected_preset)]
+                    preset_name = desc_to_name[selected_preset]
                     
                     col_apply, col_delete = st.columns(2)
                     with col_apply:
@@ -470,9 +644,7 @@ def create_streamlit_config_app(
                             if preset_name in presets:
                                 del presets[preset_name]
                                 st.session_state["presets"] = presets
-                                if "config_file" in st.session_state:
-                                    with open(st.session_state["config_file"], 'w', encoding='utf-8') as f:
-                                        yaml.dump({"presets": presets}, f, allow_unicode=True)
+                                _delete_preset_shard(preset_name)
                                 st.success(f"预设 '{preset_name}' 已删除")
                                 st.experimental_rerun()
             else:
@@ -486,10 +658,10 @@ def create_streamlit_config_app(
             if st.button("保存为新预设", key="save_preset"):
                 if new_preset_name:
                     # 收集选中的checkbox
-                    selected_options = [opt.id for opt in cb_opts 
-                                      if st.session_state.get(f"checkbox_{opt.id}", False)]
-                    
-                    save_preset(new_preset_name, new_preset_desc, cb_opts, selected_options, in_opts)
+                    selected_options = [opt.id for opt in cb_opts
+                                      if ss.get(f"checkbox_{opt.id}", False)]
+
+                    save_preset(new_preset_name, new_preset_desc, cb_opts, selected_options, in_opts, ss=ss)
                     # 清空输入
                     st.session_state["new_preset_name"] = ""
                     st.session_state["new_preset_desc"] = ""
@@ -1,17 +1,26 @@
 import streamlit as st
+import asyncio
 import logging
 import time
 import threading
 import re
 import os
+import html
 import psutil
 from datetime import datetime
 import yaml
-import queue
+from collections import deque
 import plotly.graph_objects as go
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Any, Tuple, Union
 
+# 可选依赖：有streamlit_autorefresh时用浏览器端定时器触发刷新，
+# 代替sleep+rerun每100ms整页重建一次会话
+try:
+    from streamlit_autorefresh import st_autorefresh
+except ImportError:
+    st_autorefresh = None
+
 # 设置页面配置
 st.set_page_config(
     page_title="Streamlit 日志管理器",
@@ -20,8 +29,8 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
-# 添加自定义CSS
-st.markdown("""
+# 自定义CSS提到模块常量，避免每次重跑重建字符串字面量
+_CSS = """
 <style>
     .panel-header {
         font-weight: bold;
@@ -72,7 +81,88 @@ st.markdown("""
         color: #1f77b4;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+st.markdown(_CSS, unsafe_allow_html=True)
+
+# style名到颜色的映射只读不变，提到模块层避免每次渲染重建字典
+_COLOR_MAP = {
+    "yellow": "#ffc107",
+    "cyan": "#17a2b8",
+    "magenta": "#e83e8c",
+    "blue": "#007bff",
+    "green": "#28a745",
+    "red": "#dc3545",
+    "lightblue": "#63c5da",
+    "lightgreen": "#90ee90",
+    "lightcyan": "#e0ffff",
+    "lightmagenta": "#f8bbd0",
+    "lightyellow": "#ffffe0",
+    "white": "#ffffff",
+    "light_gray": "#d3d3d3",
+    "dark_gray": "#a9a9a9"
+}
+
+# 热路径正则统一在模块加载时编译一次，emit每条日志都会用到
+_PATH_RE = re.compile(r'([A-Za-z]:\\[^\s]+|/([^\s/]+/){2,}[^\s/]+|\S+\.[a-zA-Z0-9]+)')
+_TAG_RE = re.compile(r'^\[([#@])(\w{2,})\](.*)$')
+_PROGRESS_VALUE_RE = re.compile(r'^([^%]*?)(?:\s*(?:(\(|\[)(\d+/\d+)[\)\]])?)?\s*(\d+(?:\.\d+)?)%$')
+
+
+def _parse_progress(content):
+    """手工解析进度文本，返回(前缀, 括号类型, 分数, 百分比)或None
+
+    格式固定为"前缀 (x/y) 12.3%"，手写的定点扫描避免懒惰量词
+    和嵌套可选组在热路径上的回溯开销。
+    """
+    if not content.endswith('%'):
+        return None
+    end = len(content) - 1
+    # 正则要求'%'前紧挨数字，"12.%"这类尾裸点的输入交给正则拒绝
+    if end == 0 or not content[end - 1].isdigit():
+        return None
+
+    # 从'%'向左扫出百分比数字
+    num_start = end - 1
+    seen_dot = False
+    while num_start >= 0:
+        ch = content[num_start]
+        if ch == '.' and not seen_dot:
+            seen_dot = True
+        elif not ch.isdigit():
+            break
+        num_start -= 1
+
+    number = content[num_start + 1:end]
+    if not number or number in ('.',):
+        return None
+    # 快路径只接受正则也接受的输入：裸点开头的数字（"abc .5%"）
+    # 正则把点划进前缀、只取"5"，这里退回去让它按自己的规则切；
+    # 前缀里出现'%'的（"50% done 60%"）正则整体拒绝
+    if number[0] == '.' or '%' in content[:num_start + 1]:
+        return None
+    try:
+        percentage = float(number)
+    except ValueError:
+        return None
+
+    rest = content[:num_start + 1].rstrip()
+
+    # 可选的 (x/y) 或 [x/y] 分数段
+    bracket_type = None
+    fraction = None
+    if rest.endswith((')', ']')):
+        open_ch = '(' if rest[-1] == ')' else '['
+        start = rest.rfind(open_ch)
+        if start >= 0:
+            inner = rest[start + 1:-1]
+            left, sep, right = inner.partition('/')
+            if sep and left.isdigit() and right.isdigit():
+                bracket_type = open_ch
+                fraction = inner
+                rest = rest[:start].rstrip()
+
+    return rest, bracket_type, fraction, percentage
 
 @dataclass
 class CPUInfo:
@@ -97,57 +187,80 @@ class StreamlitLogHandler(logging.Handler):
     
     def __init__(self, log_file=None):
         super().__init__()
-        self.path_regex = re.compile(r'([A-Za-z]:\\[^\s]+|/([^\s/]+/){2,}[^\s/]+|\S+\.[a-zA-Z0-9]+)')
+        self.path_regex = _PATH_RE
         self.max_msg_length = 150
         self.max_filename_length = 40
         self.enable_truncate = False
         self.log_file = log_file
         self.last_position = 0
-        self.log_queue = queue.Queue()
+        self._fh = None  # 跨多次检查保持打开的日志文件句柄
+        self._ino = 0  # 打开时的inode，用于识别删除重建式轮转
+        self._tail = b''  # 上次读取遗留的不完整行
+        # 单生产单消费场景下deque的append/popleft本身线程安全，
+        # 省掉queue.Queue每次操作的锁和条件变量开销
+        self.log_queue = deque()
+        # 缓存最近一次格式化的时间戳，同一秒内的日志复用同一字符串
+        self._ts_sec = 0
+        self._ts_str = ''
         
     def emit(self, record):
         """处理日志记录"""
         try:
-            msg = self.format(record)
-            
-            # 检查是否包含面板标识符
-            if not (msg.startswith('[#') or msg.startswith('[@')):
+            self._dispatch_raw_line(self.format(record), record.levelno)
+        except Exception:
+            self.handleError(record)
+
+    def _dispatch_raw_line(self, msg, levelno=logging.INFO):
+        """解析一条原始日志行并入队
+
+        文件尾随路径直接调用本方法，绕开LogRecord构造和
+        Handler.format的每行开销。
+        """
+        try:
+            # 检查是否包含面板标识符；元组形式一次C层扫描完成两种前缀判断
+            if not msg.startswith(('[#', '[@')):
                 return  # 如果没有面板标识符，直接返回不处理
             
-            # 检查是否是真正的进度条（同时包含@和%）
-            is_progress = '@' in msg and '%' in msg
-            
-            # 提取面板标签
-            progress_match = re.match(r'^\[@(\w{2,})\](.*)$', msg)
-            normal_match = re.match(r'^\[#(\w{2,})\](.*)$', msg)
-            
             # 获取标签和内容
             panel_name = None
             content = msg
             tag = ""
-            
-            if progress_match:
-                panel_name = progress_match.group(1)
-                content = progress_match.group(2).strip()
-                tag = f"[@{panel_name}]"
-                log_type = "progress"
-            elif normal_match:
-                panel_name = normal_match.group(1)
-                content = normal_match.group(2).strip()
-                tag = f"[#{panel_name}]"
-                log_type = "normal"
+
+            # 快速路径：绝大多数消息形如[#name]/[@name]且面板名是简单标识符，
+            # 直接定位']'并切片取名，完全绕开正则引擎
+            kind = msg[1]
+            end = msg.find(']', 2)
+            if end >= 4 and msg[2:end].isidentifier():
+                panel_name = msg[2:end]
+                content = msg[end + 1:].strip()
+                tag = f"[{kind}{panel_name}]"
+                log_type = "progress" if kind == '@' else "normal"
             else:
-                panel_name = "update"
-                log_type = "normal"
+                # 慢速路径：面板名含特殊字符时退回预编译正则，
+                # 单次扫描后按首组字符分派，@为进度、#为普通
+                tag_match = _TAG_RE.match(msg)
+                if tag_match:
+                    kind = tag_match.group(1)
+                    panel_name = tag_match.group(2)
+                    content = tag_match.group(3).strip()
+                    tag = f"[{kind}{panel_name}]"
+                    log_type = "progress" if kind == '@' else "normal"
+                else:
+                    panel_name = "update"
+                    log_type = "normal"
             
-            # 为日志条目添加时间戳
-            timestamp = datetime.now().strftime("%H:%M:%S")
+            # 为日志条目添加时间戳；strftime只在秒数变化时才重新执行
+            sec = int(time.time())
+            if sec != self._ts_sec:
+                self._ts_sec = sec
+                self._ts_str = time.strftime("%H:%M:%S", time.localtime(sec))
+            timestamp = self._ts_str
             
             # 根据日志级别添加图标
-            if record.levelno >= logging.ERROR:
+            if levelno >= logging.ERROR:
                 icon = "❌"
                 level = "error"
-            elif record.levelno >= logging.WARNING:
+            elif levelno >= logging.WARNING:
                 icon = "⚠️"
                 level = "warning"
             else:
@@ -159,7 +272,7 @@ class StreamlitLogHandler(logging.Handler):
                 content = f"{icon} {content}"
             
             # 将日志放入队列
-            self.log_queue.put({
+            self.log_queue.append({
                 "panel": panel_name,
                 "content": content,
                 "timestamp": timestamp,
@@ -169,27 +282,57 @@ class StreamlitLogHandler(logging.Handler):
             })
             
         except Exception as e:
-            self.handleError(record)
-            
+            print(f"日志行解析错误: {e}")
+
     def _check_log_file(self):
         """检查日志文件更新"""
-        if not self.log_file or not os.path.exists(self.log_file):
+        if not self.log_file:
             return
 
         try:
-            with open(self.log_file, 'r', encoding='utf-8') as f:
-                f.seek(self.last_position)
-                new_lines = f.readlines()
-                if new_lines:
-                    for line in new_lines:
-                        line = line.strip()
-                        if line:
-                            self.emit(logging.makeLogRecord({
-                                'msg': line,
-                                'levelno': logging.INFO,
-                                'created': time.time()
-                            }))
-                self.last_position = f.tell()
+            # 复用常驻句柄，避免每次检查都重新open+seek；
+            # 二进制整块读取跳过文本层的逐行解码和列表分配
+            if self._fh is None:
+                if not os.path.exists(self.log_file):
+                    return
+                self._fh = open(self.log_file, 'rb')
+                self._fh.seek(self.last_position)
+                self._ino = os.fstat(self._fh.fileno()).st_ino
+
+            data = self._fh.read()
+            if not data:
+                # 句柄上读不到新字节时才多付一次路径stat：截断
+                # （大小回退到已读位置之前）或删除重建（inode变化）
+                # 都会让旧句柄永远返回空，此时重开并从头读，
+                # 遗留的半行一并丢弃
+                try:
+                    path_stat = os.stat(self.log_file)
+                except OSError:
+                    self._fh.close()
+                    self._fh = None
+                    return
+                if (path_stat.st_ino == self._ino
+                        and path_stat.st_size >= self.last_position):
+                    return
+                self._fh.close()
+                self._fh = open(self.log_file, 'rb')
+                self._ino = os.fstat(self._fh.fileno()).st_ino
+                self.last_position = 0
+                self._tail = b''
+                data = self._fh.read()
+                if not data:
+                    return
+            self.last_position = self._fh.tell()
+
+            # 把上次遗留的半行与本次数据拼接后再按行切分，
+            # 最后一段可能仍不完整，留到下次读取
+            lines = (self._tail + data).split(b'\n')
+            self._tail = lines.pop()
+
+            for raw in lines:
+                raw = raw.strip()
+                if raw:
+                    self._dispatch_raw_line(raw.decode('utf-8', 'replace'))
         except Exception as e:
             print(f"Error reading log file: {e}")
 
@@ -220,7 +363,42 @@ class StreamlitLoggerManager:
             
             # 初始化session state变量
             st.session_state.layout_config = final_layout
-            st.session_state.log_entries = {panel: [] for panel in final_layout}
+
+            # 行列划分只依赖布局配置，构造时算好一次，重跑直接读取
+            panels_by_row = []
+            current_row = []
+            total_ratio = 0
+            for panel_name, config in final_layout.items():
+                ratio = config.get("ratio", 1)
+                if total_ratio + ratio > 12:  # 每行最大容纳12个单位
+                    panels_by_row.append(current_row)
+                    current_row = [(panel_name, config)]
+                    total_ratio = ratio
+                else:
+                    current_row.append((panel_name, config))
+                    total_ratio += ratio
+            if current_row:
+                panels_by_row.append(current_row)
+
+            st.session_state.panels_by_row = panels_by_row
+            st.session_state.col_ratios = [
+                [cfg.get("ratio", 1) / sum(c.get("ratio", 1) for _, c in row) for _, cfg in row]
+                for row in panels_by_row
+            ]
+            # 面板头部HTML按需构建一次后缓存
+            st.session_state.panel_header_html = {}
+            # 有界deque自动淘汰最老的日志，追加是O(1)且无需切片截断；
+            # 按列存储（SoA），渲染扫描时省去每条目三次字典键查找
+            st.session_state.log_entries = {
+                panel: {
+                    "content": deque(maxlen=100),
+                    "level": deque(maxlen=100),
+                    "ts": deque(maxlen=100),
+                }
+                for panel in final_layout
+            }
+            # 每面板缓存渲染好的HTML行，重跑时直接join而不是逐条重新拼接
+            st.session_state.log_html = {panel: deque(maxlen=100) for panel in final_layout}
             st.session_state.progress_bars = {panel: {} for panel in final_layout}
             st.session_state.system_status = SystemStatus()
             st.session_state.logger_initialized = True
@@ -244,158 +422,229 @@ class StreamlitLoggerManager:
             # 将处理器存储到session state
             st.session_state.log_handler = handler
             
-            # 启动系统状态监控线程
-            threading.Thread(target=cls._monitor_system_status, daemon=True).start()
-            
-            # 如果提供了日志文件，设置文件监控
-            if log_file:
-                threading.Thread(target=cls._monitor_log_file, daemon=True).start()
+            # 所有周期性监控复用同一个调度线程
+            cls._start_monitors(handler, log_file)
 
-    @classmethod
-    def _monitor_system_status(cls):
-        """监控系统状态的后台线程"""
-        last_io_time = time.time()
-        last_io = DiskIOInfo()
-        
+    @staticmethod
+    def _snapshot():
+        """一次采齐CPU/内存/磁盘IO三项指标
+
+        渲染端只读缓存在session_state里的结果，自己不触发psutil调用。
+        """
+        return (
+            psutil.cpu_percent(interval=None),
+            psutil.virtual_memory().percent,
+            psutil.disk_io_counters(),
+        )
+
+    @staticmethod
+    def _start_file_observer(handler, log_file):
+        """尝试用watchdog事件驱动日志读取，返回Observer或None"""
         try:
-            while True:
+            from watchdog.observers import Observer
+            from watchdog.events import FileSystemEventHandler
+        except ImportError:
+            return None
+
+        # 基于文件系统事件，只在文件真正被写入时读取，空闲时零CPU
+        class _LogFileEventHandler(FileSystemEventHandler):
+            def on_modified(self, event):
+                if event.src_path == log_file:
+                    handler._check_log_file()
+
+        observer = Observer()
+        observer.schedule(_LogFileEventHandler(), os.path.dirname(log_file) or ".")
+        observer.daemon = True
+        observer.start()
+        handler._check_log_file()  # 补读启动前已有的内容
+        return observer
+
+    @classmethod
+    def _start_monitors(cls, handler, log_file):
+        """在单个调度线程上复用全部周期性监控任务
+
+        一个事件循环用call_later自我重排代替每个监控各占一个
+        daemon线程做sleep轮询，省下线程栈和每tick的上下文切换。
+        """
+        loop = asyncio.new_event_loop()
+
+        # 预热一次，让后续cpu_percent(interval=None)非阻塞地返回区间均值
+        psutil.cpu_percent(interval=None)
+        # 单调时钟做差值计算，不受系统时间回拨影响
+        io_state = {"last_time": time.monotonic(), "last_io": DiskIOInfo()}
+
+        def system_tick():
+            try:
                 if "system_status" in st.session_state:
-                    # 更新CPU和内存
-                    cpu_usage = psutil.cpu_percent()
-                    memory_usage = psutil.virtual_memory().percent
-                    
-                    # 磁盘IO
-                    current_time = time.time()
-                    disk_io = psutil.disk_io_counters()
-                    
-                    if disk_io and (current_time - last_io_time) > 0:
-                        time_diff = current_time - last_io_time
-                        read_speed = (disk_io.read_bytes - last_io.read_bytes) / time_diff / 1024 / 1024
-                        write_speed = (disk_io.write_bytes - last_io.write_bytes) / time_diff / 1024 / 1024
-                        
-                        disk_io_info = DiskIOInfo(
-                            read_speed=read_speed,
-                            write_speed=write_speed,
+                    cpu_usage, memory_usage, disk_io = cls._snapshot()
+                    current_time = time.monotonic()
+
+                    # 原地更新set_layout创建的实例，渲染端只读标量字段，
+                    # 无需每2秒重新分配三个dataclass
+                    status = st.session_state.system_status
+                    status.cpu.usage = cpu_usage
+                    status.memory_usage = memory_usage
+
+                    if disk_io and (current_time - io_state["last_time"]) > 0:
+                        time_diff = current_time - io_state["last_time"]
+                        last_io = io_state["last_io"]
+                        io = status.disk_io
+                        io.read_speed = (disk_io.read_bytes - last_io.read_bytes) / time_diff / 1024 / 1024
+                        io.write_speed = (disk_io.write_bytes - last_io.write_bytes) / time_diff / 1024 / 1024
+                        io.read_bytes = disk_io.read_bytes
+                        io.write_bytes = disk_io.write_bytes
+
+                        io_state["last_io"] = DiskIOInfo(
                             read_bytes=disk_io.read_bytes,
                             write_bytes=disk_io.write_bytes
                         )
-                        
-                        last_io = disk_io_info
-                        last_io_time = current_time
-                    else:
-                        disk_io_info = last_io
-                    
-                    # 更新状态
-                    st.session_state.system_status = SystemStatus(
-                        cpu=CPUInfo(usage=cpu_usage),
-                        memory_usage=memory_usage,
-                        disk_io=disk_io_info,
-                        last_update=datetime.now()
-                    )
-                
-                time.sleep(2)  # 更新频率
-                
-        except Exception as e:
-            print(f"系统状态监控错误: {e}")
+                        io_state["last_time"] = current_time
 
-    @classmethod
-    def _monitor_log_file(cls):
-        """监控日志文件的后台线程"""
-        if "log_handler" in st.session_state and st.session_state.log_file:
+                    status.last_update = datetime.now()
+            except Exception as e:
+                print(f"系统状态监控错误: {e}")
+            loop.call_later(2.0, system_tick)
+
+        def log_tick(interval):
+            # 没有watchdog时退化为轮询：空闲时指数放宽到1s，
+            # 一旦有新内容立即收紧回0.1s
             try:
-                while True:
-                    st.session_state.log_handler._check_log_file()
-                    time.sleep(0.1)  # 检查频率
+                position_before = handler.last_position
+                handler._check_log_file()
+                if handler.last_position != position_before:
+                    interval = 0.1
+                else:
+                    interval = min(interval * 2, 1.0)
             except Exception as e:
                 print(f"日志文件监控错误: {e}")
+            loop.call_later(interval, log_tick, interval)
+
+        loop.call_later(2.0, system_tick)
+
+        if log_file:
+            observer = cls._start_file_observer(handler, log_file)
+            if observer is None:
+                loop.call_later(0.1, log_tick, 0.1)
+
+        threading.Thread(target=loop.run_forever, daemon=True).start()
 
     @classmethod
     def process_log_queue(cls):
         """处理日志队列中的消息"""
         if "log_handler" in st.session_state:
             handler = st.session_state.log_handler
-            
-            # 处理队列中的所有消息
-            while not handler.log_queue.empty():
+
+            # 一次性把队列清空到本地列表，再按面板分组批量入库，
+            # 避免每条消息都经历一次锁获取和列表截断
+            drained = []
+            try:
+                while True:
+                    drained.append(handler.log_queue.popleft())
+            except IndexError:
+                pass
+
+            new_by_panel = {}
+            for log_entry in drained:
                 try:
-                    log_entry = handler.log_queue.get(block=False)
                     panel = log_entry["panel"]
                     content = log_entry["content"]
                     log_type = log_entry["type"]
-                    
+
                     # 确保面板存在
                     if panel not in st.session_state.log_entries:
-                        st.session_state.log_entries[panel] = []
+                        st.session_state.log_entries[panel] = {
+                            "content": deque(maxlen=100),
+                            "level": deque(maxlen=100),
+                            "ts": deque(maxlen=100),
+                        }
+                        st.session_state.log_html[panel] = deque(maxlen=100)
                         st.session_state.progress_bars[panel] = {}
-                    
+
                     # 根据日志类型处理
                     if log_type == "progress":
                         cls._process_progress_entry(panel, content)
                     else:
                         # 为普通日志添加时间戳
-                        timestamped_content = f"[{log_entry['timestamp']}] {content}"
-                        
-                        # 添加到面板日志
-                        st.session_state.log_entries[panel].append({
-                            "content": timestamped_content,
-                            "level": log_entry["level"],
-                            "timestamp": log_entry["timestamp"]
-                        })
-                        
-                        # 限制每个面板的日志条数
-                        max_logs = 100
-                        if len(st.session_state.log_entries[panel]) > max_logs:
-                            st.session_state.log_entries[panel] = st.session_state.log_entries[panel][-max_logs:]
-                    
-                except queue.Empty:
-                    break
+                        new_by_panel.setdefault(panel, []).append((
+                            f"[{log_entry['timestamp']}] {content}",
+                            log_entry["level"],
+                            log_entry["timestamp"]
+                        ))
+
                 except Exception as e:
                     print(f"处理日志错误: {e}")
 
+            # 每面板批量追加到三个平行列，maxlen自动淘汰最老条目；
+            # HTML在入库时转义并渲染一次，最新的行排在最前
+            for panel, entries in new_by_panel.items():
+                store = st.session_state.log_entries[panel]
+                html_lines = st.session_state.log_html[panel]
+                for entry_content, level, ts in entries:
+                    store["content"].append(entry_content)
+                    store["level"].append(level)
+                    store["ts"].append(ts)
+                    html_lines.appendleft(
+                        f'<div class="log-line {level}-log">'
+                        f'{html.escape(entry_content)}</div>'
+                    )
+
+            # 只有真正入库了新内容才标记界面为脏
+            if drained:
+                st.session_state.logs_dirty = True
+
     @classmethod
     def _process_progress_entry(cls, panel, content):
         """处理进度条日志条目"""
-        # 定义进度条正则表达式
-        PROGRESS_PATTERN = r'^([^%]*?)(?:\s*(?:(\(|\[)(\d+/\d+)[\)\]])?)?\s*(\d+(?:\.\d+)?)%$'
-        
-        match = re.match(PROGRESS_PATTERN, content)
-        if match:
-            prefix = match.group(1).strip()
-            bracket_type = match.group(2)  # 括号类型 ( 或 [
-            fraction = match.group(3)  # 分数部分 x/y
-            percentage = float(match.group(4))  # 百分比值
-            
-            # 生成进度条标识符
-            bar_id = prefix if prefix else f"进度条_{len(st.session_state.progress_bars[panel])}"
-            
-            # 格式化显示文本
-            if fraction and bracket_type:
-                display_text = f"{prefix} {bracket_type}{fraction}{')' if bracket_type=='(' else ']'} {percentage:.1f}%"
-            else:
-                display_text = f"{prefix} {percentage:.1f}%"
-            
-            # 更新或添加进度条
-            st.session_state.progress_bars[panel][bar_id] = {
-                "percentage": percentage,
-                "text": display_text,
-                "is_complete": percentage >= 100
-            }
-            
-            # 移除已完成的进度条（保持较少数量的已完成进度条）
-            completed_bars = [bid for bid, bar in st.session_state.progress_bars[panel].items() 
-                             if bar["is_complete"]]
-            
-            # 保留最近的5个已完成进度条
-            if len(completed_bars) > 5:
-                for bar_id in completed_bars[:-5]:
-                    st.session_state.progress_bars[panel].pop(bar_id, None)
+        # 常规格式走手写解析，异常输入才回退到正则
+        parsed = _parse_progress(content)
+        if parsed is None:
+            match = _PROGRESS_VALUE_RE.match(content)
+            if not match:
+                return
+            parsed = (
+                match.group(1).strip(),
+                match.group(2),  # 括号类型 ( 或 [
+                match.group(3),  # 分数部分 x/y
+                float(match.group(4))  # 百分比值
+            )
+
+        prefix, bracket_type, fraction, percentage = parsed
+
+        # 生成进度条标识符
+        bar_id = prefix if prefix else f"进度条_{len(st.session_state.progress_bars[panel])}"
+
+        # 格式化显示文本
+        if fraction and bracket_type:
+            display_text = f"{prefix} {bracket_type}{fraction}{')' if bracket_type=='(' else ']'} {percentage:.1f}%"
+        else:
+            display_text = f"{prefix} {percentage:.1f}%"
+
+        # 更新或添加进度条
+        st.session_state.progress_bars[panel][bar_id] = {
+            "percentage": percentage,
+            "text": display_text,
+            "is_complete": percentage >= 100
+        }
+
+        # 移除已完成的进度条（保持较少数量的已完成进度条）
+        completed_bars = [bid for bid, bar in st.session_state.progress_bars[panel].items()
+                         if bar["is_complete"]]
+
+        # 保留最近的5个已完成进度条
+        if len(completed_bars) > 5:
+            for bar_id in completed_bars[:-5]:
+                st.session_state.progress_bars[panel].pop(bar_id, None)
 
 def render_logger_ui():
     """渲染日志管理器界面"""
     if "logger_initialized" not in st.session_state:
         st.warning("请先调用 StreamlitLoggerManager.set_layout() 初始化日志管理器")
         return
-    
+
+    # 浏览器端每500ms触发一次重跑，服务端脚本跑完即结束，不占用线程
+    if st_autorefresh is not None:
+        st_autorefresh(interval=500, limit=None, key="log_refresh")
+
     # 处理日志队列中的消息
     StreamlitLoggerManager.process_log_queue()
     
@@ -418,78 +667,48 @@ def render_logger_ui():
     with col4:
         st.markdown(f"**磁盘IO:** R:{status.disk_io.read_speed:.1f}MB/s W:{status.disk_io.write_speed:.1f}MB/s")
     
-    # 创建所有面板的组合视图
-    layout_config = st.session_state.layout_config
-    
-    # 计算布局
-    panels_by_row = {}
-    current_row = []
-    total_ratio = 0
-    
-    # 按照ratio将面板分组到不同行
-    for panel_name, config in layout_config.items():
-        ratio = config.get("ratio", 1)
-        if total_ratio + ratio > 12:  # 每行最大容纳12个单位
-            panels_by_row[len(panels_by_row)] = current_row
-            current_row = [(panel_name, config)]
-            total_ratio = ratio
-        else:
-            current_row.append((panel_name, config))
-            total_ratio += ratio
-    
-    # 添加最后一行
-    if current_row:
-        panels_by_row[len(panels_by_row)] = current_row
-    
-    # 渲染每一行的面板
-    for row_idx, panels in panels_by_row.items():
-        # 计算每个面板的列宽
-        total_ratio = sum(config.get("ratio", 1) for _, config in panels)
-        cols = st.columns([config.get("ratio", 1) / total_ratio for _, config in panels])
-        
+    # 行列划分与列宽在set_layout时已算好，这里直接渲染
+    panels_by_row = st.session_state.panels_by_row
+    col_ratios = st.session_state.col_ratios
+
+    for row_idx, panels in enumerate(panels_by_row):
+        cols = st.columns(col_ratios[row_idx])
+
         # 在每列中渲染对应的面板
         for i, (panel_name, config) in enumerate(panels):
             with cols[i]:
                 render_panel(panel_name, config)
     
-    # 定期刷新界面
-    st.empty()
-    time.sleep(0.1)
-    st.experimental_rerun()
+    dirty = st.session_state.pop("logs_dirty", False)
+
+    if st_autorefresh is None:
+        # 回退路径：沿用rerun循环，但空闲时放宽刷新间隔
+        st.empty()
+        time.sleep(0.1 if dirty else 0.5)
+        st.experimental_rerun()
 
 def render_panel(panel_name, config):
     """渲染单个日志面板"""
-    title = config.get("title", panel_name)
-    style = config.get("style", "blue")
-    
-    # 将style转换为颜色
-    color_map = {
-        "yellow": "#ffc107",
-        "cyan": "#17a2b8",
-        "magenta": "#e83e8c",
-        "blue": "#007bff",
-        "green": "#28a745",
-        "red": "#dc3545",
-        "lightblue": "#63c5da",
-        "lightgreen": "#90ee90",
-        "lightcyan": "#e0ffff",
-        "lightmagenta": "#f8bbd0",
-        "lightyellow": "#ffffe0",
-        "white": "#ffffff",
-        "light_gray": "#d3d3d3",
-        "dark_gray": "#a9a9a9"
-    }
-    
-    color = color_map.get(style, "#007bff")
-    
-    # 面板容器
-    st.markdown(f"""
+    # 面板头部HTML首次渲染时构建一次并缓存，之后直接输出
+    header_html = st.session_state.panel_header_html.get(panel_name)
+    if header_html is None:
+        title = config.get("title", panel_name)
+        style = config.get("style", "blue")
+
+        # 将style转换为颜色
+        color = _COLOR_MAP.get(style, "#007bff")
+
+        # 面板容器
+        header_html = f"""
     <div class="panel-container">
         <div class="panel-header" style="background-color: {color}; color: white;">
             {title}
         </div>
         <div id="panel-{panel_name}">
-    """, unsafe_allow_html=True)
+    """
+        st.session_state.panel_header_html[panel_name] = header_html
+
+    st.markdown(header_html, unsafe_allow_html=True)
     
     # 渲染进度条
     if panel_name in st.session_state.progress_bars:
@@ -504,20 +723,13 @@ def render_panel(panel_name, config):
                 st.progress(min(percentage / 100, 1.0))
                 st.caption(text)
     
-    # 渲染日志内容
-    if panel_name in st.session_state.log_entries:
-        logs = st.session_state.log_entries[panel_name]
-        
-        log_content = ""
-        for log in reversed(logs):  # 最新的日志在顶部
-            level_class = f"{log['level']}-log"
-            log_content += f'<div class="log-line {level_class}">{log["content"]}</div>'
-        
-        st.markdown(f"""
-        <div class="panel-content">
-            {log_content}
-        </div>
-        """, unsafe_allow_html=True)
+    # 渲染日志内容：直接join入库时缓存好的HTML行（已是最新在前）
+    html_lines = st.session_state.log_html.get(panel_name)
+    if html_lines is not None:
+        st.markdown(
+            f'<div class="panel-content">{"".join(html_lines)}</div>',
+            unsafe_allow_html=True
+        )
     
     st.markdown("</div></div>", unsafe_allow_html=True)
 
@@ -10,6 +10,12 @@ import time
 import random
 import logging
 import argparse
+import atexit
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
 from datetime import datetime
 import tempfile
 from nodes.record.logger_config import setup_logger
@@ -23,6 +29,101 @@ config = {
 }
 logger, config_info = setup_logger(config)
 
+
+# 秒级前缀缓存：strftime+localtime只在跨秒时各算一次，
+# 同一秒内的后续日志只格式化毫秒部分
+_TS_CACHE = [0, '']
+
+
+def _timestamp():
+    """生成与logging asctime一致的时间戳，如 2025-03-27 22:03:14,456"""
+    now = time.time()
+    sec = int(now)
+    if sec != _TS_CACHE[0]:
+        _TS_CACHE[0] = sec
+        _TS_CACHE[1] = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(sec))
+    return _TS_CACHE[1] + f",{int((now - sec) * 1000):03d}"
+
+
+class _LogWriter:
+    """后台写入线程：批量取走队列里的日志行，合并成一次os.write落盘
+
+    生产线程只付一次入队的代价；文件系统调用次数从每条一次
+    降到每批一次，也不再有logging锁可争。
+    """
+
+    _SENTINEL = None
+
+    def __init__(self, log_file):
+        self._queue = queue.SimpleQueue()
+        self._fd = os.open(log_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self._thread = threading.Thread(target=self._drain, daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def put(self, line):
+        self._queue.put(line)
+
+    def _drain(self):
+        while True:
+            line = self._queue.get()
+            if line is self._SENTINEL:
+                break
+
+            # 把积压的行并进同一批，一次系统调用写完
+            lines = [line]
+            while len(lines) < 256:
+                try:
+                    nxt = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if nxt is self._SENTINEL:
+                    self._queue.put(self._SENTINEL)
+                    break
+                lines.append(nxt)
+
+            os.write(self._fd, ('\n'.join(lines) + '\n').encode('utf-8'))
+
+    def close(self):
+        self._queue.put(self._SENTINEL)
+        self._thread.join(timeout=1.0)
+        try:
+            os.close(self._fd)
+        except OSError:
+            pass
+
+
+# 状态消息模板表：挑中哪条才格式化哪条，不再每次调用把6条
+# 消息全部构造出来只用其中1条
+_STATUS_TEMPLATES = (
+    ("[#status]当前处理批次: ", "", lambda: str(random.randint(1, 100))),
+    ("[#status]已完成任务数: ", "", lambda: str(random.randint(10, 500))),
+    ("[#status]累计处理文件: ", "个", lambda: str(random.randint(100, 1000))),
+    ("[#progress]总体进度: ", "%", lambda: f"{random.uniform(0, 100):.1f}"),
+    ("[#progress]任务队列: ", "个待处理", lambda: str(random.randint(0, 50))),
+    ("[#progress]已分析文件数: ", "个", lambda: str(random.randint(10, 200))),
+)
+
+
+class _QueueLogger:
+    """与logging.Logger同形的轻量外壳，生产线程只做格式化和入队"""
+
+    def __init__(self, writer):
+        self._writer = writer
+
+    def _log(self, level, msg):
+        self._writer.put(f"{_timestamp()} - {level} - {msg}")
+
+    def info(self, msg):
+        self._log('INFO', msg)
+
+    def warning(self, msg):
+        self._log('WARNING', msg)
+
+    def error(self, msg):
+        self._log('ERROR', msg)
+
+
 class DemoScript:
     """模拟脚本类，生成各种类型的日志"""
     
@@ -36,6 +137,11 @@ class DemoScript:
         """
         self.script_name = script_name
         self.duration = duration
+
+        # 批量预采样随机数，C实现的批量填充远快于逐次调用random
+        self._rng = np.random.default_rng()
+        self._cpu_samples = self._rng.uniform(10, 95, size=1024)
+        self._memory_samples = self._rng.uniform(100, 500, size=1024)
         
         # 创建脚本日志目录
          
@@ -53,21 +159,13 @@ class DemoScript:
         register_script(self.script_info)
     
     def _setup_logger(self):
-        """设置日志记录器"""
-        
-        # 移除所有已有处理器
-        for handler in logger.handlers[:]:
-            logger.removeHandler(handler)
-        
-        # 文件处理器
-        file_handler = logging.FileHandler(self.log_file, encoding='utf-8')
-        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-        file_handler.setFormatter(formatter)
-        
-        logger.addHandler(file_handler)
-        logger.setLevel(logging.INFO)
-        
-        return logger
+        """设置日志记录器
+
+        生产线程只向队列追加格式化好的行，落盘由_LogWriter的单个
+        后台线程批量完成，锁和write系统调用都移出了热路径。
+        """
+        self._writer = _LogWriter(self.log_file)
+        return _QueueLogger(self._writer)
     
     def run(self):
         """运行模拟脚本"""
@@ -100,13 +198,16 @@ class DemoScript:
     def _log_performance(self):
         """记录性能信息"""
         start_time = time.time()
+        index = 0
         while (time.time() - start_time) < self.duration:
-            cpu = random.uniform(10, 95)
-            memory = random.uniform(100, 500)
-            
+            # 循环取用预采样的批量随机数
+            cpu = self._cpu_samples[index % len(self._cpu_samples)]
+            memory = self._memory_samples[index % len(self._memory_samples)]
+            index += 1
+
             self.logger.info(f"[#performance]CPU使用率: {cpu:.1f}%")
             self.logger.info(f"[#performance]内存占用: {memory:.1f} MB")
-            
+
             time.sleep(5)
     
     def _run_file_processing(self):
@@ -157,51 +258,69 @@ class DemoScript:
         """
         start_time = time.time()
         duration_per_item = self.duration / (total * 1.2)  # 确保能在脚本结束前完成
-        
+
+        # 一次性批量采样整个循环需要的延迟
+        delays = self._rng.uniform(min_delay, max_delay, size=total)
+
+        # 把不变的前缀部分预编译成模板，循环里只格式化变化的字段
+        progress_tmpl = f"[@{panel}]{task_name} [{{i}}/{total}] {{pct:.1f}}%"
+        detail_tmpl = f"[#{panel}]处理项目 {{i}}: {task_name}_{{i}}"
+        error_tmpl = f"[#{panel}]处理 {task_name}_{{i}} 时发生错误"
+        warning_tmpl = f"[#{panel}]处理 {task_name}_{{i}} 有潜在问题"
+
+        # 方法引用提升到循环外，迭代里不再逐次做属性查找
+        info = self.logger.info
+        error = self.logger.error
+        warning = self.logger.warning
+        rnd = random.random
+        sleep = time.sleep
+        now = time.time
+
         for i in range(1, total + 1):
-            if (time.time() - start_time) >= self.duration:
+            if (now() - start_time) >= self.duration:
                 break
-                
-            percentage = (i / total) * 100
-            
+
             # 记录进度
-            self.logger.info(f"[@{panel}]{task_name} [{i}/{total}] {percentage:.1f}%")
-            
+            info(progress_tmpl.format(i=i, pct=(i / total) * 100))
+
             # 随机添加一些详细日志
-            if random.random() < 0.3:
-                self.logger.info(f"[#{panel}]处理项目 {i}: {task_name}_{i}")
-            
+            if rnd() < 0.3:
+                info(detail_tmpl.format(i=i))
+
             # 随机添加警告或错误
-            if random.random() < 0.1:
-                if random.random() < 0.3:
-                    self.logger.error(f"[#{panel}]处理 {task_name}_{i} 时发生错误")
+            if rnd() < 0.1:
+                if rnd() < 0.3:
+                    error(error_tmpl.format(i=i))
                 else:
-                    self.logger.warning(f"[#{panel}]处理 {task_name}_{i} 有潜在问题")
-            
+                    warning(warning_tmpl.format(i=i))
+
             # 延迟，但确保不会超过总时长
-            sleep_time = min(random.uniform(min_delay, max_delay), duration_per_item)
-            time.sleep(sleep_time)
+            sleep(min(delays[i - 1], duration_per_item))
     
     def _log_random_status(self):
         """记录随机状态信息"""
-        statuses = [
-            f"[#status]当前处理批次: {random.randint(1, 100)}",
-            f"[#status]已完成任务数: {random.randint(10, 500)}",
-            f"[#status]累计处理文件: {random.randint(100, 1000)}个",
-            f"[#progress]总体进度: {random.uniform(0, 100):.1f}%",
-            f"[#progress]任务队列: {random.randint(0, 50)}个待处理",
-            f"[#progress]已分析文件数: {random.randint(10, 200)}个"
-        ]
-        
-        self.logger.info(random.choice(statuses))
+        prefix, suffix, param_gen = _STATUS_TEMPLATES[random.randrange(len(_STATUS_TEMPLATES))]
+        self.logger.info(prefix + param_gen() + suffix)
+
+
+def _run_demo_script(script_name, log_dir, duration):
+    """进程池工作函数：在独立进程中创建并运行一个模拟脚本
+
+    每个进程有自己的GIL和文件处理器，多脚本日志生成
+    随进程数线性扩展，而不是在线程间争抢解释器。
+    """
+    script = DemoScript(script_name, log_dir, duration)
+    script.run()
+    return script.log_file
 
 
 def main():
     """主函数"""
     parser = argparse.ArgumentParser(description="单脚本日志监控器演示程序")
+    parser.add_argument('--count', type=int, default=1, help="并行运行的脚本数量")
     parser.add_argument('--duration', type=int, default=60, help="脚本运行时长（秒）")
     parser.add_argument('--log-dir', type=str, default=None, help="日志目录")
-    
+
     args = parser.parse_args()
     
     # 创建临时日志目录
@@ -212,19 +331,34 @@ def main():
         os.makedirs(log_dir, exist_ok=True)
     
     print(f"日志目录: {log_dir}")
-    
-    # 创建并运行模拟脚本
-    script_name = "单脚本演示"
-    script = DemoScript(script_name, log_dir, args.duration)
-    print(f"脚本信息已注册，日志文件: {script.log_file}")
-    
-    try:
-        print("开始运行演示脚本，按Ctrl+C停止...")
-        script.run()
-    except KeyboardInterrupt:
-        print("\n脚本已停止")
-    
-    print(f"\n演示完成！日志文件保存在: {script.log_file}")
+
+    if args.count > 1:
+        # 多脚本用进程池并行生成，避免所有脚本挤在一个GIL上
+        try:
+            print(f"开始并行运行 {args.count} 个演示脚本，按Ctrl+C停止...")
+            with ProcessPoolExecutor(max_workers=args.count) as executor:
+                futures = [
+                    executor.submit(_run_demo_script, f"演示脚本 {i}", log_dir, args.duration)
+                    for i in range(1, args.count + 1)
+                ]
+                for future in futures:
+                    print(f"演示脚本已完成，日志文件: {future.result()}")
+        except KeyboardInterrupt:
+            print("\n脚本已停止")
+    else:
+        # 创建并运行模拟脚本
+        script_name = "单脚本演示"
+        script = DemoScript(script_name, log_dir, args.duration)
+        print(f"脚本信息已注册，日志文件: {script.log_file}")
+
+        try:
+            print("开始运行演示脚本，按Ctrl+C停止...")
+            script.run()
+        except KeyboardInterrupt:
+            print("\n脚本已停止")
+
+        print(f"\n演示完成！日志文件保存在: {script.log_file}")
+
     print("请运行 `streamlit run main.py` 查看日志")
 
 
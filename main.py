@@ -4,12 +4,22 @@ import time
 import sys
 import psutil
 import threading
+import multiprocessing
 import random
 import logging
+import queue
 import tempfile
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 
-from src.utils.file_utils import read_log_file, is_script_active
+# 可选依赖：有streamlit_autorefresh时用组件定时触发rerun，
+# 脚本体执行完即归还线程，不再让整个rerun周期阻塞在sleep上
+try:
+    from streamlit_autorefresh import st_autorefresh
+except ImportError:
+    st_autorefresh = None
+
+from src.utils.file_utils import iter_new_entries, is_script_active, close_reader
 from src.logger_manager import StreamlitLoggerManager
 
 # 脚本信息全局变量
@@ -113,6 +123,34 @@ def register_script(script_info):
     
     return True
 
+# Formatter对格式串的解析只需要做一次，全部演示脚本共用同一个实例
+_SHARED_FORMATTER = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+
+class _BufferedFileHandler(logging.FileHandler):
+    """带64KB写缓冲的FileHandler
+
+    StreamHandler默认每条记录flush一次，缓冲形同虚设；这里把
+    flush节流到至多每0.5秒一次，其余时间让缓冲继续攒批，
+    write系统调用按批次而不是按记录计数。
+    """
+
+    # 类定义时就绑定时钟引用，emit热路径上少一次模块属性查找
+    _monotonic = staticmethod(time.monotonic)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._last_flush = self._monotonic()
+
+    def _open(self):
+        return open(self.baseFilename, self.mode, encoding=self.encoding,
+                    buffering=64 * 1024)
+
+    def flush(self):
+        now = self._monotonic()
+        if now - self._last_flush >= 0.5:
+            self._last_flush = now
+            super().flush()
+
 # 添加自动日志生成功能
 def generate_demo_logs(script_id, log_file, duration=3600):
     """生成演示日志"""
@@ -123,13 +161,18 @@ def generate_demo_logs(script_id, log_file, duration=3600):
     for handler in logger.handlers[:]:
         logger.removeHandler(handler)
     
-    # 文件处理器
-    file_handler = logging.FileHandler(log_file, encoding='utf-8', mode='w')
-    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-    file_handler.setFormatter(formatter)
-    
-    logger.addHandler(file_handler)
+    # 文件处理器：延迟到首条记录才打开文件，写入走大缓冲
+    file_handler = _BufferedFileHandler(log_file, encoding='utf-8', mode='w', delay=True)
+    file_handler.setFormatter(_SHARED_FORMATTER)
+
+    # 四个工作线程只向内存队列入队，格式化和文件写入全部
+    # 由监听线程批量消化，热路径上不再有FileHandler的锁和flush
+    log_queue = queue.Queue(-1)
+    logger.addHandler(QueueHandler(log_queue))
     logger.setLevel(logging.INFO)
+
+    queue_listener = QueueListener(log_queue, file_handler)
+    queue_listener.start()
     
     # 记录开始信息
     logger.info(f"[#status]自动演示脚本 {script_id} 已启动")
@@ -174,11 +217,20 @@ def generate_demo_logs(script_id, log_file, duration=3600):
     for t in threads:
         t.start()
     
-    # 主循环，生成随机状态信息
+    # 主循环，生成随机状态信息；睡眠间隔批量预采样后循环取用
+    import numpy as np
+
+    rng = np.random.default_rng()
+    sleep_samples = rng.uniform(1, 3, size=1024)
+    index = 0
+
     start_time = time.time()
     while (time.time() - start_time) < duration and not stop_event.is_set():
-        log_status(logger)
-        time.sleep(random.uniform(1, 3))
+        # 日志被抑制时直接跳过随机参数和消息字符串的构造
+        if logger.isEnabledFor(logging.INFO):
+            log_status(logger)
+        time.sleep(sleep_samples[index % len(sleep_samples)])
+        index += 1
     
     # 等待所有线程结束
     stop_event.set()
@@ -187,54 +239,137 @@ def generate_demo_logs(script_id, log_file, duration=3600):
     
     logger.info(f"[#status]自动演示脚本 {script_id} 已结束")
 
+    # 停止监听线程，把队列中残留的记录冲刷到文件
+    queue_listener.stop()
+    file_handler.close()
+
 def simulate_progress(logger, panel, task_name, total, min_delay, max_delay, stop_event):
     """模拟进度更新"""
+    # 一次性批量采样整个循环需要的随机数，C层批量填充
+    # 远快于每次迭代调用三四次Python级random
+    import numpy as np
+
+    # “规划/执行”拆分：数值部分（延迟、百分比、分支判定）整批
+    # 在C层算完，Python循环只负责按计划发消息和睡眠
+    rng = np.random.default_rng()
+    delays = rng.uniform(min_delay, max_delay, size=total)
+    percentages = np.arange(1, total + 1) * (100.0 / total)
+    detail_plan = rng.random(size=total) < 0.3
+    event_plan = rng.random(size=total) < 0.1
+    severe_plan = rng.random(size=total) < 0.3
+
+    # 各级别开关在循环外判定一次，被抑制的级别连消息都不构造
+    info_enabled = logger.isEnabledFor(logging.INFO)
+    warn_enabled = logger.isEnabledFor(logging.WARNING)
+    error_enabled = logger.isEnabledFor(logging.ERROR)
+
+    # 方法引用和消息骨架都提升到循环外：每次迭代不再做属性查找，
+    # f-string里也只剩真正变化的字段
+    info = logger.info
+    error = logger.error
+    warning = logger.warning
+    sleep = time.sleep
+    is_set = stop_event.is_set
+
+    progress_prefix = f"[@{panel}]{task_name} ["
+    progress_mid = f"/{total}] "
+    detail_prefix = f"[#{panel}]处理项目 "
+    detail_mid = f": {task_name}_"
+    event_prefix = f"[#{panel}]处理 {task_name}_"
+
     for i in range(1, total + 1):
-        if stop_event.is_set():
+        if is_set():
             break
-            
-        percentage = (i / total) * 100
-        
+
         # 记录进度
-        logger.info(f"[@{panel}]{task_name} [{i}/{total}] {percentage:.1f}%")
-        
-        # 随机添加一些详细日志
-        if random.random() < 0.3:
-            logger.info(f"[#{panel}]处理项目 {i}: {task_name}_{i}")
-        
+        if info_enabled:
+            info(progress_prefix + str(i) + progress_mid + f"{percentages[i - 1]:.1f}%")
+
+            # 随机添加一些详细日志
+            if detail_plan[i - 1]:
+                info(detail_prefix + str(i) + detail_mid + str(i))
+
         # 随机添加警告或错误
-        if random.random() < 0.1:
-            if random.random() < 0.3:
-                logger.error(f"[#{panel}]处理 {task_name}_{i} 时发生错误")
-            else:
-                logger.warning(f"[#{panel}]处理 {task_name}_{i} 有潜在问题")
-        
+        if event_plan[i - 1]:
+            if severe_plan[i - 1]:
+                if error_enabled:
+                    error(event_prefix + str(i) + " 时发生错误")
+            elif warn_enabled:
+                warning(event_prefix + str(i) + " 有潜在问题")
+
         # 随机延迟
-        time.sleep(random.uniform(min_delay, max_delay))
+        sleep(delays[i - 1])
 
 def log_performance(logger, stop_event):
     """记录性能信息"""
+    # 预采样一批数值，循环里按下标取用
+    import numpy as np
+
+    rng = np.random.default_rng()
+    cpu_samples = rng.uniform(10, 95, size=1024)
+    memory_samples = rng.uniform(100, 500, size=1024)
+    index = 0
+
     while not stop_event.is_set():
-        cpu = random.uniform(10, 95)
-        memory = random.uniform(100, 500)
-        
-        logger.info(f"[#performance]CPU使用率: {cpu:.1f}%")
-        logger.info(f"[#performance]内存占用: {memory:.1f} MB")
-        
+        if logger.isEnabledFor(logging.INFO):
+            cpu = cpu_samples[index % len(cpu_samples)]
+            memory = memory_samples[index % len(memory_samples)]
+            index += 1
+
+            logger.info(f"[#performance]CPU使用率: {cpu:.1f}%")
+            logger.info(f"[#performance]内存占用: {memory:.1f} MB")
+
         time.sleep(5)
 
+# 状态消息模板在模块加载时分类一次，并预先切成前缀/后缀；
+# 热路径用一次字符串拼接取代str.format的格式串解析，
+# 参数生成器直接产出字符串
+_STATUS_TEMPLATES = (
+    ("[#status]当前处理批次: ", "", lambda: str(random.randint(1, 100))),
+    ("[#status]已完成任务数: ", "", lambda: str(random.randint(10, 500))),
+    ("[#status]累计处理文件: ", "个", lambda: str(random.randint(100, 1000))),
+    ("[#progress]总体进度: ", "%", lambda: f"{random.uniform(0, 100):.1f}"),
+    ("[#progress]任务队列: ", "个待处理", lambda: str(random.randint(0, 50))),
+    ("[#progress]已分析文件数: ", "个", lambda: str(random.randint(10, 200))),
+)
+
 def log_status(logger):
     """记录状态信息"""
-    statuses = [
-        f"[#status]当前处理批次: {random.randint(1, 100)}",
-        f"[#status]已完成任务数: {random.randint(10, 500)}",
-        f"[#status]累计处理文件: {random.randint(100, 1000)}个",
-        f"[#progress]总体进度: {random.uniform(0, 100):.1f}%",
-        f"[#progress]任务队列: {random.randint(0, 50)}个待处理",
-        f"[#progress]已分析文件数: {random.randint(10, 200)}个"
-    ]
-    
-    logger.info(random.choice(statuses))
+    prefix, suffix, param_gen = _STATUS_TEMPLATES[random.randrange(len(_STATUS_TEMPLATES))]
+    logger.info(prefix + param_gen() + suffix)
+
+@st.cache_data(ttl=1)
+def _snapshot_cpu_memory():
+    """采样CPU与内存使用率；1秒内的重复rerun直接复用缓存值"""
+    return psutil.cpu_percent(), psutil.virtual_memory().percent
+
+@st.cache_resource
+def _disk_partitions():
+    """磁盘分区表按会话进程缓存一次，分区的增删在应用重启后才体现"""
+    return psutil.disk_partitions()
+
+@st.cache_data(ttl=30)
+def _snapshot_disks():
+    """枚举磁盘分区及用量
+
+    分区表不会秒级变化，disk_usage每次都要走内核statvfs，
+    30秒TTL把每次rerun的每分区一次系统调用省下来。
+    """
+    disks = []
+    for disk in _disk_partitions():
+        try:
+            usage = psutil.disk_usage(disk.mountpoint)
+            disks.append({
+                "device": disk.device,
+                "mountpoint": disk.mountpoint,
+                "fstype": disk.fstype,
+                "total": usage.total / (1024 * 1024 * 1024),  # GB
+                "used": usage.used / (1024 * 1024 * 1024),    # GB
+                "percent": usage.percent
+            })
+        except:
+            pass
+    return disks
 
 def start_demo_script():
     """启动演示脚本"""
@@ -261,13 +396,15 @@ def start_demo_script():
         }
         register_script(script_info)
         
-        # 启动日志生成线程
-        thread = threading.Thread(
+        # 启动日志生成进程：4个演示脚本各带4个工作线程，留在
+        # 本进程里会全部挤在查看器的GIL上；每个脚本一个独立进程
+        # 后互不争抢，日志只经文件交换，无需任何IPC
+        process = multiprocessing.Process(
             target=generate_demo_logs,
             args=(script_id, log_file, 3600),  # 运行1小时
             daemon=True
         )
-        thread.start()
+        process.start()
 
 def main():
     """主应用入口点"""
@@ -346,27 +483,56 @@ def main():
     
     # 监控所有脚本日志文件
     active_scripts = []
-    
-    # 更新所有脚本的日志
+
+    # 记录每个日志文件上次见到的(mtime, size)，没有写入就不安排读取
+    if not hasattr(st.session_state, "log_stamps"):
+        st.session_state.log_stamps = {}
+
+    # 两段式批量刷新：先收集整轮的读取参数，集中完成所有读取，
+    # 再统一把结果路由回各脚本，摊薄每次刷新的簿记开销
+    read_specs = []
     for script_id, script_config in list(st.session_state.script_configs.items()):
         log_file = script_config.get("log_file", "")
-        
-        if log_file and os.path.exists(log_file):
-            # 读取日志文件
-            last_position = script_config.get("last_position", 0)
-            log_entries, new_position = read_log_file(log_file, last_position)
-            
-            # 更新位置
-            script_config["last_position"] = new_position
-            
-            # 处理日志条目
-            if log_entries:
-                StreamlitLoggerManager._update_dashboard(script_id, log_entries)
-                script_config["last_update"] = datetime.now()
-            
-            # 检查脚本是否活跃
-            if is_script_active(script_id):
-                active_scripts.append(script_id)
+        if not log_file:
+            continue
+
+        # 一次stat同时拿到存在性、mtime和大小
+        try:
+            log_stat = os.stat(log_file)
+        except OSError:
+            continue
+
+        stamp = (log_stat.st_mtime_ns, log_stat.st_size)
+        if st.session_state.log_stamps.get(script_id) != stamp:
+            st.session_state.log_stamps[script_id] = stamp
+            read_specs.append((script_id, log_file, script_config.get("last_position", 0)))
+
+    read_results = [
+        (script_id, last_position, iter_new_entries(log_file, last_position))
+        for script_id, log_file, last_position in read_specs
+    ]
+
+    for script_id, last_position, (entry_iter, new_position) in read_results:
+        script_config = st.session_state.script_configs[script_id]
+
+        # 更新位置
+        script_config["last_position"] = new_position
+
+        # 有新增内容时把条目直接流式路由进仪表板，不物化中间列表。
+        # 轮转/截断后位置会回退（归零重读），新位置反而小于旧值，
+        # 所以按不等判断，而不是只认增长
+        if new_position != last_position:
+            StreamlitLoggerManager._update_dashboard(script_id, entry_iter)
+            script_config["last_update"] = time.time()
+
+    # 检查脚本是否活跃（包括本轮没有新内容的脚本）
+    for script_id, script_config in list(st.session_state.script_configs.items()):
+        if is_script_active(script_id):
+            active_scripts.append(script_id)
+        else:
+            # 掉线脚本的常驻fd即时归还，不随进程生命周期积累；
+            # 脚本恢复后下次读取会重新打开
+            close_reader(script_config.get("log_file", ""))
     
     # 创建选项卡
     if active_scripts:
@@ -378,13 +544,13 @@ def main():
             with col1:
                 st.metric("活跃脚本数", len(active_scripts))
             
+            cpu_usage, memory_percent = _snapshot_cpu_memory()
+
             with col2:
-                cpu_usage = psutil.cpu_percent()
                 st.metric("CPU使用率", f"{cpu_usage:.1f}%")
-            
+
             with col3:
-                memory = psutil.virtual_memory()
-                st.metric("内存使用率", f"{memory.percent:.1f}%")
+                st.metric("内存使用率", f"{memory_percent:.1f}%")
             
             with col4:
                 # 切换系统信息展开状态的按钮
@@ -398,22 +564,8 @@ def main():
             # 磁盘信息
             st.subheader("磁盘使用情况")
             disk_cols = st.columns(4)
-            disks = []
-            
-            for disk in psutil.disk_partitions():
-                try:
-                    usage = psutil.disk_usage(disk.mountpoint)
-                    disks.append({
-                        "device": disk.device,
-                        "mountpoint": disk.mountpoint,
-                        "fstype": disk.fstype,
-                        "total": usage.total / (1024 * 1024 * 1024),  # GB
-                        "used": usage.used / (1024 * 1024 * 1024),    # GB
-                        "percent": usage.percent
-                    })
-                except:
-                    pass
-            
+            disks = _snapshot_disks()
+
             for i, disk in enumerate(disks[:4]):  # 显示前4个磁盘
                 with disk_cols[i % 4]:
                     st.metric(
@@ -486,9 +638,14 @@ def main():
         register_script(script_info)
         ```        """)
     
-    # 自动刷新
-    time.sleep(refresh_interval)
-    st.rerun()
+    # 自动刷新：优先用autorefresh组件，rerun由前端定时触发，
+    # 无新日志的轮次在文件stamp检查处就近乎零开销地退出；
+    # 组件缺失时退回sleep+rerun轮询
+    if st_autorefresh is not None:
+        st_autorefresh(interval=int(refresh_interval * 1000), key="log_poll")
+    else:
+        time.sleep(refresh_interval)
+        st.rerun()
 
 if __name__ == "__main__":
     main() 
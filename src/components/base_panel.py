@@ -7,14 +7,28 @@ class BasePanel(ABC):
         self.title = title
         self.icon = icon
         self.style = style
-        self.is_visible = True
+        # 可见性变化观察者：仪表板管理器借此在真正变化时
+        # 使自己的可见面板视图缓存失效
+        self._visibility_observers = []
+        self._is_visible = True
         self.is_expanded = True
-        
+
+    @property
+    def is_visible(self) -> bool:
+        return self._is_visible
+
+    @is_visible.setter
+    def is_visible(self, value: bool):
+        if value != self._is_visible:
+            self._is_visible = value
+            for callback in self._visibility_observers:
+                callback()
+
     @abstractmethod
     def render(self, container):
         """渲染面板内容"""
         pass
-    
+
     def toggle_visibility(self):
         """切换面板可见性"""
         self.is_visible = not self.is_visible
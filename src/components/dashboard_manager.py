@@ -8,19 +8,44 @@ class DashboardManager:
         self.panels: Dict[str, BasePanel] = {}
         self.columns_per_row = 2
         self.is_visible = True
-        
+        # 可见面板视图只在面板增删或可见性变化时重建，
+        # 普通rerun直接复用缓存列表
+        self._visible_cache = None
+        # 行切分随可见面板集合和列数一起缓存：布局稳定时每次
+        # rerun直接遍历现成的行列表，不重做切片
+        self._rows_cache = None
+        # 每个面板对应一个st.empty占位符：面板内容写进占位符，
+        # 前端按占位符为单位做diff，而不是整个网格
+        self._slots: Dict[str, object] = {}
+
+    def _invalidate_visible(self):
+        """面板可见性变化回调：丢弃可见面板视图缓存"""
+        self._visible_cache = None
+        self._rows_cache = None
+
     def add_panel(self, panel_id: str, panel: BasePanel):
         """添加面板"""
         self.panels[panel_id] = panel
-    
+        panel._visibility_observers.append(self._invalidate_visible)
+        self._invalidate_visible()
+
     def remove_panel(self, panel_id: str):
         """移除面板"""
-        if panel_id in self.panels:
-            del self.panels[panel_id]
-    
+        # pop一次完成存在性判断和摘除，不做两次哈希查找
+        panel = self.panels.pop(panel_id, None)
+        if panel is not None:
+            try:
+                panel._visibility_observers.remove(self._invalidate_visible)
+            except ValueError:
+                pass
+            self._invalidate_visible()
+
     def set_columns_per_row(self, columns: int):
         """设置每行显示的面板数"""
-        self.columns_per_row = max(1, min(columns, 4))
+        columns = max(1, min(columns, 4))
+        if columns != self.columns_per_row:
+            self.columns_per_row = columns
+            self._rows_cache = None
     
     def toggle_visibility(self):
         """切换仪表板可见性"""
@@ -32,12 +57,30 @@ class DashboardManager:
             return
             
         with container:
-            # 创建面板网格
-            visible_panels = [p for p in self.panels.values() if p.is_visible]
-            for i in range(0, len(visible_panels), self.columns_per_row):
-                row_panels = visible_panels[i:i + self.columns_per_row]
+            # 创建面板网格（可见面板视图与行切分都带缓存）
+            rows = self._rows_cache
+            if rows is None:
+                visible_panels = self._visible_cache
+                if visible_panels is None:
+                    visible_panels = [
+                        (pid, p) for pid, p in self.panels.items() if p.is_visible
+                    ]
+                    self._visible_cache = visible_panels
+                cpr = self.columns_per_row
+                rows = [
+                    visible_panels[i:i + cpr]
+                    for i in range(0, len(visible_panels), cpr)
+                ]
+                self._rows_cache = rows
+            for row_panels in rows:
+                # 列proto必须每次rerun重新发给前端（rerun会清空
+                # 页面），能提升的是Python侧的行切分
                 cols = st.columns(len(row_panels))
-                
-                for j, panel in enumerate(row_panels):
+
+                for j, (panel_id, panel) in enumerate(row_panels):
                     with cols[j]:
-                        panel.render(st.container()) 
\ No newline at end of file
+                        # 每个单元格放一个占位符，面板写进占位符的
+                        # 容器里：单个面板的内容变化只在占位符内diff
+                        slot = st.empty()
+                        self._slots[panel_id] = slot
+                        panel.render(slot.container()) 
\ No newline at end of file
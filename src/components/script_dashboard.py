@@ -25,7 +25,13 @@ class ScriptDashboard:
         self.performance_panel = PerformancePanel()
         self.dashboard_manager.add_panel("preset", self.preset_panel)
         self.dashboard_manager.add_panel("performance", self.performance_panel)
-        
+
+        # 计时标题包进fragment后按1秒节拍独立刷新，走秒不再
+        # 触发整个仪表板子树的重渲染（旧版streamlit没有fragment
+        # 时退化为随整体rerun更新）
+        if hasattr(st, "fragment"):
+            self._render_header = st.fragment(run_every="1s")(self._render_header)
+
     def add_log_panel(self, panel_id: str, title: str, icon: str = "", style: str = "default") -> LogPanel:
         """添加日志面板"""
         panel = LogPanel(title, icon, style)
@@ -35,47 +41,66 @@ class ScriptDashboard:
     def toggle_visibility(self):
         """切换仪表板可见性"""
         self.is_visible = not self.is_visible
-    
+
+    def _on_columns_change(self):
+        """列数滑块回调：仅在控件值真正变化时写回"""
+        self.dashboard_manager.set_columns_per_row(
+            st.session_state[f"slider_{self.script_name}"])
+
+    def _on_preset_toggle(self):
+        """预设面板可见性回调"""
+        self.preset_panel.is_visible = st.session_state[f"preset_visible_{self.script_name}"]
+
+    def _on_perf_toggle(self):
+        """性能面板可见性回调"""
+        self.performance_panel.is_visible = st.session_state[f"perf_visible_{self.script_name}"]
+
+    def _render_header(self):
+        """显示标题和运行时间"""
+        elapsed = datetime.now() - self.start_time
+        hours, remainder = divmod(elapsed.total_seconds(), 3600)
+        minutes, seconds = divmod(remainder, 60)
+        time_str = f"{int(hours):02}:{int(minutes):02}:{int(seconds):02}"
+
+        st.subheader(f"{self.script_name} - 运行时间: {time_str}")
+
     def render(self, container):
         """渲染脚本仪表板"""
         if not self.is_visible:
             return
             
         with container:
-            # 显示运行时间
-            elapsed = datetime.now() - self.start_time
-            hours, remainder = divmod(elapsed.total_seconds(), 3600)
-            minutes, seconds = divmod(remainder, 60)
-            time_str = f"{int(hours):02}:{int(minutes):02}:{int(seconds):02}"
-            
             # 显示标题和运行时间
-            st.subheader(f"{self.script_name} - 运行时间: {time_str}")
-            
-            # 顶部可扩展区域，包含配置面板控制
+            self._render_header()
+
+            # 顶部可扩展区域，包含配置面板控制；控件状态由
+            # on_change回调写回，普通rerun不再重复给仪表板对象赋值
             with st.expander("控制面板配置", expanded=False):
                 # 添加每行列数滑块
-                columns_per_row = st.slider(
-                    "每行显示面板数", 
-                    min_value=1, 
-                    max_value=4, 
+                st.slider(
+                    "每行显示面板数",
+                    min_value=1,
+                    max_value=4,
                     value=self.dashboard_manager.columns_per_row,
-                    key=f"slider_{self.script_name}"
+                    key=f"slider_{self.script_name}",
+                    on_change=self._on_columns_change
                 )
-                self.dashboard_manager.set_columns_per_row(columns_per_row)
-                
+
                 # 添加预设和性能面板的可见性控制
                 col1, col2 = st.columns(2)
                 with col1:
-                    self.preset_panel.is_visible = st.checkbox(
-                        "显示预设配置", 
+                    st.checkbox(
+                        "显示预设配置",
                         value=self.preset_panel.is_visible,
-                        key=f"preset_visible_{self.script_name}"
+                        key=f"preset_visible_{self.script_name}",
+                        on_change=self._on_preset_toggle
                     )
                 with col2:
-                    self.performance_panel.is_visible = st.checkbox(
-                        "显示性能配置", 
+                    st.checkbox(
+                        "显示性能配置",
                         value=self.performance_panel.is_visible,
-                        key=f"perf_visible_{self.script_name}"
+                        key=f"perf_visible_{self.script_name}",
+                        on_change=self._on_perf_toggle
                     )
             
             # 渲染仪表板
@@ -1,36 +1,76 @@
 import streamlit as st
+import functools
 import os
 import time
 from datetime import datetime
 import json
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import psutil
 
 from src.components.script_dashboard import ScriptDashboard
 from src.utils.file_utils import read_log_file, is_script_active
 from src.utils.log_parser import parse_progress
 
+
+@st.cache_data(ttl=1.0)
+def _snapshot_system():
+    """采样一次系统状态
+
+    virtual_memory和disk_io_counters都要读/proc，1秒TTL把
+    同一秒内多个脚本的仪表板更新合并成一次采样。
+    """
+    disk_io = psutil.disk_io_counters()
+    return (
+        psutil.cpu_percent(),
+        psutil.virtual_memory().percent,
+        disk_io.read_bytes / 1024 / 1024,
+        disk_io.write_bytes / 1024 / 1024,
+    )
+
+
+@functools.lru_cache(maxsize=256)
+def _derive_ids(log_file: str) -> Tuple[str, str]:
+    """从日志路径推导(script_id, script_name)
+
+    同一路径在轮询中反复传入，os.path的规范化和字符串拆分
+    折叠成一次字典查找；rsplit只切最后一个点，带点的文件名
+    也能取到完整主名。
+    """
+    return (
+        os.path.basename(os.path.dirname(log_file)),
+        os.path.basename(log_file).rsplit('.', 1)[0],
+    )
+
+
 class StreamlitLoggerManager:
     """Streamlit日志管理器"""
-    
-    _default_layout = {
-        "status": {"title": "📊 总体进度", "style": "lightyellow", "icon": "✅"},
-        "progress": {"title": "🔄 当前进度", "style": "lightcyan", "icon": "🔄"},
-        "performance": {"title": "⚡ 性能配置", "style": "lightgreen", "icon": "⚡"},
-        "image_convert": {"title": "🖼️ 图片转换", "style": "lightorange", "icon": "🖼️"},
-        "archive_ops": {"title": "📦 压缩包处理", "style": "lightmagenta", "icon": "📦"},
-        "file_ops": {"title": "📁 文件操作", "style": "lightblue", "icon": "📁"}
-    }
-    
+
     _running_scripts = {}
     _config_dir = None
     _dashboards = {}
-    
+
+    @classmethod
+    @functools.lru_cache(maxsize=1)
+    def _get_default_layout(cls):
+        """默认面板布局：首次访问时构建并缓存
+
+        import阶段不再构建这组嵌套dict，测试收集等只导入
+        不渲染的场景省掉无谓开销；lru_cache(1)让之后的访问
+        退化成一次查表。
+        """
+        return {
+            "status": {"title": "📊 总体进度", "style": "lightyellow", "icon": "✅"},
+            "progress": {"title": "🔄 当前进度", "style": "lightcyan", "icon": "🔄"},
+            "performance": {"title": "⚡ 性能配置", "style": "lightgreen", "icon": "⚡"},
+            "image_convert": {"title": "🖼️ 图片转换", "style": "lightorange", "icon": "🖼️"},
+            "archive_ops": {"title": "📦 压缩包处理", "style": "lightmagenta", "icon": "📦"},
+            "file_ops": {"title": "📁 文件操作", "style": "lightblue", "icon": "📁"}
+        }
+
     @staticmethod
     def set_layout(layout_config=None, log_file=None):
         """设置日志布局并初始化"""
-        script_id = os.path.basename(os.path.dirname(log_file))
-        script_name = os.path.basename(log_file).split('.')[0]
+        script_id, script_name = _derive_ids(log_file)
         
         # 创建脚本仪表板
         if script_id not in StreamlitLoggerManager._dashboards:
@@ -38,7 +78,7 @@ class StreamlitLoggerManager:
             StreamlitLoggerManager._dashboards[script_id] = dashboard
             
             # 添加默认面板
-            for panel_id, config in (layout_config or StreamlitLoggerManager._default_layout).items():
+            for panel_id, config in (layout_config or StreamlitLoggerManager._get_default_layout()).items():
                 dashboard.add_log_panel(
                     panel_id,
                     config["title"],
@@ -51,7 +91,7 @@ class StreamlitLoggerManager:
             st.session_state.script_configs = {}
         
         # 使用默认布局或自定义布局
-        final_layout = layout_config or StreamlitLoggerManager._default_layout
+        final_layout = layout_config or StreamlitLoggerManager._get_default_layout()
         
         # 保存脚本配置
         st.session_state.script_configs[script_id] = {
@@ -59,7 +99,7 @@ class StreamlitLoggerManager:
             "log_file": log_file,
             "script_name": script_name,
             "last_position": 0,
-            "last_update": datetime.now(),
+            "last_update": time.time(),
             "start_time": datetime.now()
         }
         
@@ -74,54 +114,67 @@ class StreamlitLoggerManager:
     @staticmethod
     def _update_dashboard(script_id: str, log_entries: List[dict]):
         """更新仪表板内容"""
-        if script_id not in StreamlitLoggerManager._dashboards:
+        # get一次完成存在性判断和取值，不做两次哈希查找
+        dashboard = StreamlitLoggerManager._dashboards.get(script_id)
+        if dashboard is None:
             return
-            
-        dashboard = StreamlitLoggerManager._dashboards[script_id]
         
-        # 更新系统状态
+        # 更新系统状态（带1秒TTL缓存的采样）
         try:
-            cpu_usage = psutil.cpu_percent()
-            memory = psutil.virtual_memory()
-            disk_io = psutil.disk_io_counters()
-            
+            cpu_usage, memory_percent, disk_read, disk_write = _snapshot_system()
+
             dashboard.system_panel.update_stats(
                 cpu=cpu_usage,
-                memory=memory.percent,
+                memory=memory_percent,
                 disk_io={
-                    "read": disk_io.read_bytes / 1024 / 1024,
-                    "write": disk_io.write_bytes / 1024 / 1024
+                    "read": disk_read,
+                    "write": disk_write
                 }
             )
         except:
             pass
         
-        # 更新日志面板
+        # 更新日志面板：先按面板分组再整批派发——日志一次extend
+        # 进deque，进度条每个前缀只保留最后一次更新（中间进度值
+        # 在下一次渲染前本来就不可见）
+        from src.panels.log_panel import LogPanel
+
+        panels = dashboard.dashboard_manager.panels
+        logs_by_panel = {}
+        progress_by_panel = {}
+
         for entry in log_entries:
             panel_name = entry["panel_name"]
-            panel_type = entry["panel_type"]
+            panel = panels.get(panel_name)
+            if panel is None or not isinstance(panel, LogPanel):
+                continue
+
             content = entry["content"]
-            
-            if panel_name in dashboard.dashboard_manager.panels:
-                panel = dashboard.dashboard_manager.panels[panel_name]
-                from src.panels.log_panel import LogPanel
-                if isinstance(panel, LogPanel):
-                    if panel_type == "@":  # 进度条
-                        progress_info = parse_progress(content)
-                        if progress_info:
-                            panel.update_progress(progress_info.get("prefix", "进度"), progress_info)
-                    else:  # 普通日志
-                        panel.add_log({
-                            "level": entry["level"],
-                            "timestamp": entry["timestamp"].split(' ')[1].split(',')[0],
-                            "content": content
-                        })
+
+            if entry["panel_type"] == "@":  # 进度条
+                progress_info = parse_progress(content)
+                if progress_info:
+                    prefix = progress_info.get("prefix", "进度")
+                    progress_by_panel.setdefault(panel_name, {})[prefix] = progress_info
+            else:  # 普通日志
+                logs_by_panel.setdefault(panel_name, []).append({
+                    "level": entry["level"],
+                    # 解析时已按定宽切好HH:MM:SS；外部构造的条目退回切片
+                    "timestamp": entry.get("time_of_day") or entry["timestamp"][11:19],
+                    "content": content
+                })
+
+        for panel_name, logs in logs_by_panel.items():
+            panels[panel_name].extend_logs(logs)
+
+        for panel_name, progress_map in progress_by_panel.items():
+            panel = panels[panel_name]
+            for prefix, progress_info in progress_map.items():
+                panel.update_progress(prefix, progress_info)
 
     @staticmethod
     def _render_dashboard(script_id: str, container):
         """渲染仪表板"""
-        if script_id not in StreamlitLoggerManager._dashboards:
-            return
-            
-        dashboard = StreamlitLoggerManager._dashboards[script_id]
-        dashboard.render(container) 
\ No newline at end of file
+        dashboard = StreamlitLoggerManager._dashboards.get(script_id)
+        if dashboard is not None:
+            dashboard.render(container) 
\ No newline at end of file
@@ -1,23 +1,50 @@
+import html
+
 import streamlit as st
+from collections import deque
 from src.components.base_panel import BasePanel
-from typing import Dict, List
+from typing import Deque, Dict
+
+# 各级别的行模板查表分发：渲染循环里不再按级别逐条分支，
+# 级别未知时落到默认模板
+_LEVEL_TEMPLATES = {
+    "error": '<p class="red-text">❌ [{t}] {c}</p>',
+    "warning": '<p class="yellow-text">⚠️ [{t}] {c}</p>',
+}
+_DEFAULT_TEMPLATE = '<p>ℹ️ [{t}] {c}</p>'
 
 class LogPanel(BasePanel):
     """日志面板类"""
     def __init__(self, title: str, icon: str = "", style: str = "default"):
         super().__init__(title, icon, style)
-        self.logs: List[Dict] = []
+        # maxlen让追加时O(1)自动淘汰最旧条目，不再做列表切片拷贝
+        self.logs: Deque[Dict] = deque(maxlen=100)
         self.progress_bars: Dict[str, Dict] = {}
-        
+
     def add_log(self, log_entry: dict):
         """添加日志条目"""
         self.logs.append(log_entry)
-        # 限制日志数量
-        if len(self.logs) > 100:
-            self.logs = self.logs[-100:]
+
+    def extend_logs(self, log_entries):
+        """批量添加日志条目，deque的maxlen自动淘汰最旧的"""
+        self.logs.extend(log_entries)
     
     def update_progress(self, progress_id: str, progress_info: dict):
         """更新进度条"""
+        # 以0.5%为步长量化百分比：低于UI分辨率的抖动不再产生
+        # 新值，同一进度的重复更新可以按值直接判等
+        percentage = progress_info.get("percentage")
+        if percentage is not None:
+            progress_info["percentage"] = int(percentage * 2) / 2.0
+        # 量化后数值没变的重复汇报直接丢弃，保留已有的dict，
+        # 停滞的长任务每秒多次汇报时不再反复替换同值对象
+        old = self.progress_bars.get(progress_id)
+        if (
+            old is not None
+            and old.get("percentage") == progress_info.get("percentage")
+            and old.get("text") == progress_info.get("text")
+        ):
+            return
         self.progress_bars[progress_id] = progress_info
     
     def render(self, container):
@@ -35,15 +62,14 @@ class LogPanel(BasePanel):
                     st.progress(min(percentage / 100, 1.0))
                     st.caption(text)
                 
-                # 渲染日志
-                for log in reversed(self.logs):
-                    level = log.get("level", "info")
-                    timestamp = log.get("timestamp", "")
-                    content = log.get("content", "")
-                    
-                    if level == "error":
-                        st.markdown(f'<p class="red-text">❌ [{timestamp}] {content}</p>', unsafe_allow_html=True)
-                    elif level == "warning":
-                        st.markdown(f'<p class="yellow-text">⚠️ [{timestamp}] {content}</p>', unsafe_allow_html=True)
-                    else:
-                        st.write(f"ℹ️ [{timestamp}] {content}") 
\ No newline at end of file
+                # 渲染日志：拼成一个HTML块后用单次st.markdown输出，
+                # 每个面板每次rerun只发一条前端消息，而不是每行一条
+                if self.logs:
+                    block = "\n".join(
+                        _LEVEL_TEMPLATES.get(log.get("level"), _DEFAULT_TEMPLATE).format(
+                            t=log.get("timestamp", ""),
+                            c=html.escape(log.get("content", "")),
+                        )
+                        for log in reversed(self.logs)
+                    )
+                    st.markdown(block, unsafe_allow_html=True) 
\ No newline at end of file
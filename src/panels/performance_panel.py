@@ -1,9 +1,26 @@
 import streamlit as st
 from src.components.base_panel import BasePanel
+import functools
 import importlib
 import os
 import sys
 
+
+@functools.lru_cache(maxsize=1)
+def _load_perf_config():
+    """定位并导入性能配置模块，进程内只做一次
+
+    路径拼接、sys.path修改和importlib查找都不便宜，
+    缓存后每次rerun只剩一次函数调用。导入失败（ImportError）
+    不会被缓存，下次渲染会重试。
+    """
+    root_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../.."))
+    if root_path not in sys.path:
+        sys.path.append(root_path)
+
+    return importlib.import_module("config.performance_config")
+
+
 class PerformancePanel(BasePanel):
     """性能配置面板类"""
     def __init__(self, title: str = "性能配置", icon: str = "⚡", style: str = "lightgreen"):
@@ -17,15 +34,10 @@ class PerformancePanel(BasePanel):
         with container:
             with st.expander(f"{self.icon} {self.title}", expanded=self.is_expanded):
                 try:
-                    # 尝试动态导入performance_config模块
-                    root_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../.."))
-                    if root_path not in sys.path:
-                        sys.path.append(root_path)
-                    
-                    # 导入性能配置模块
+                    # 导入性能配置模块（缓存后重复rerun为O(1)）
                     try:
-                        perf_config = importlib.import_module("config.performance_config")
-                        
+                        perf_config = _load_perf_config()
+
                         # 显示当前配置信息
                         st.subheader("当前性能配置")
                         st.write(f"线程数: {perf_config.get_thread_count()}")
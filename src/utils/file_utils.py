@@ -1,99 +1,213 @@
+import mmap
 import os
 import streamlit as st
+from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Dict, Tuple, Optional
+from typing import Iterator, List, Dict, Tuple, Optional
 import time
 
 from src.utils.log_parser import parse_log_line
 
-def read_log_file(log_file: str, last_position: int = 0) -> Tuple[List[Dict], int]:
-    """读取日志文件并返回解析后的日志条目和新位置"""
-    if not os.path.exists(log_file):
-        return [], last_position
-    
+
+@dataclass(slots=True)
+class _ReaderState:
+    """单个日志文件的常驻读取状态
+
+    fd用于按偏移读取新增字节，省去每次轮询的open/close；
+    映射在文件增长时重建，顺序访问提示让内核激进预读。
+    inode记录打开时的文件身份，用于识别删除重建式的轮转。
+    把它们放进一个slots对象，轮询路径每个文件只查一次字典，
+    字段访问走C级属性槽。
+    """
+    fd: int
+    ino: int
+    mapping: Optional[mmap.mmap] = None
+
+
+_READERS: Dict[str, _ReaderState] = {}
+
+
+def _open_reader(log_file: str) -> Optional[_ReaderState]:
+    """按路径打开日志文件并登记常驻读取状态；打不开时返回None"""
+    try:
+        fd = os.open(log_file, os.O_RDONLY)
+    except OSError:
+        return None
+    state = _READERS[log_file] = _ReaderState(fd, os.fstat(fd).st_ino)
+    return state
+
+
+def close_reader(log_file: str) -> None:
+    """关闭并移除某个日志文件的常驻读取状态
+
+    脚本下线时调用，fd和映射不随进程生命周期积累；
+    之后再读同一路径会重新打开。
+    """
+    state = _READERS.pop(log_file, None)
+    if state is None:
+        return
+    if state.mapping is not None:
+        state.mapping.close()
+    try:
+        os.close(state.fd)
+    except OSError:
+        pass
+
+
+def _read_new_bytes(log_file: str, last_position: int) -> Tuple[Optional[bytes], int]:
+    """读取last_position之后的新增字节
+
+    返回(新增字节, 起始位置)：常规情况下起始位置就是
+    last_position；文件被截断或删除重建（同路径换inode）时
+    丢弃旧fd从头重读，起始位置归零，调用方的位置随之重置。
+    文件不存在时返回(None, last_position)。
+    """
+    state = _READERS.get(log_file)
+    if state is None:
+        state = _open_reader(log_file)
+        if state is None:
+            return None, last_position
+
+    # 先用一次fstat探测大小：没有新增字节时整个刷新只花一个系统调用
+    size = os.fstat(state.fd).st_size
+    if size < last_position:
+        # 截断：已读偏移落在文件末尾之外，按路径重开并从头读
+        close_reader(log_file)
+        state = _open_reader(log_file)
+        if state is None:
+            return None, last_position
+        last_position = 0
+        size = os.fstat(state.fd).st_size
+    if size <= last_position:
+        # 缓存fd上看不到新增字节时才多付一次路径stat：删除重建
+        # 后的新文件inode不同，旧fd的fstat会永远停在旧大小
+        try:
+            path_ino = os.stat(log_file).st_ino
+        except OSError:
+            close_reader(log_file)
+            return None, last_position
+        if path_ino == state.ino:
+            return b'', last_position
+        close_reader(log_file)
+        state = _open_reader(log_file)
+        if state is None:
+            return None, last_position
+        last_position = 0
+        size = os.fstat(state.fd).st_size
+        if size <= 0:
+            return b'', 0
+
+    m = state.mapping
+    # mmap.size()返回的是文件大小而非映射长度，增长判断必须
+    # 用len(m)对比，否则映射永远不重建、增量读永远是空
+    if m is None or len(m) < size:
+        if m is not None:
+            m.close()
+        try:
+            m = mmap.mmap(state.fd, size, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # 个别文件系统（或特殊文件）不支持映射，退回lseek+os.read
+            return _read_tail(state.fd, last_position, size), last_position
+        if hasattr(mmap, 'MADV_SEQUENTIAL'):
+            m.madvise(mmap.MADV_SEQUENTIAL)
+        state.mapping = m
+
+    return m[last_position:size], last_position
+
+
+def _read_tail(fd: int, last_position: int, size: int) -> bytes:
+    """mmap不可用时的兜底路径：二进制定位后分块读取新增字节"""
+    os.lseek(fd, last_position, os.SEEK_SET)
+    remaining = size - last_position
+    chunks = []
+    while remaining > 0:
+        chunk = os.read(fd, min(remaining, 1 << 16))
+        if not chunk:
+            break
+        remaining -= len(chunk)
+        chunks.append(chunk)
+    return b''.join(chunks)
+
+
+def _parse_lines(content: str) -> Iterator[Dict]:
+    """逐行解析日志内容，边扫描边产出解析结果"""
+    for line in content.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+
+        log_entry = parse_log_line(line)
+        if log_entry:
+            yield log_entry
+
+
+def iter_new_entries(log_file: str, last_position: int = 0) -> Tuple[Iterator[Dict], int]:
+    """读取新增内容并返回(解析条目迭代器, 新位置)
+
+    读取、解码和逐行解析融合成对新增字节的一趟流水线：
+    条目由生成器逐个产出，调用方可以直接把它们路由进面板，
+    不必先物化完整的条目列表再遍历一遍。
+    """
     try:
-        log_entries = []
-        new_position = last_position
-        
-        # 尝试不同的编码方式
-        encodings = ['utf-8', 'gbk', 'gb2312', 'gb18030', 'utf-16', 'ascii', 'latin1']
-        content = None
-        error_info = None
-        
-        for encoding in encodings:
-            try:
-                with open(log_file, 'r', encoding=encoding) as f:
-                    # 定位到上次读取位置
-                    f.seek(last_position)
-                    content = f.read()
-                break
-            except UnicodeDecodeError as e:
-                continue
-            except Exception as e:
-                error_info = str(e)
-                continue
-        
-        if content is None:
-            if error_info:
-                st.error(f"读取日志文件出错: {error_info}")
-            else:
-                # 尝试二进制方式读取来检查文件是否为空
-                try:
-                    with open(log_file, 'rb') as f:
-                        f.seek(last_position)
-                        raw_content = f.read()
-                    
-                    if not raw_content:
-                        return [], last_position  # 文件为空或已经读取到末尾
-                    else:
-                        st.error(f"无法使用支持的编码方式读取日志文件: {log_file}")
-                except Exception as e:
-                    st.error(f"读取日志文件出错: {e}")
-            
-            return [], last_position
-            
-        # 处理读取的内容
-        for line in content.splitlines():
-            line = line.strip()
-            if not line:
-                continue
-                
-            log_entry = parse_log_line(line)
-            if log_entry:
-                log_entries.append(log_entry)
-        
-        # 更新读取位置
-        new_position = last_position + len(content.encode('utf-8'))
-        
-        return log_entries, new_position
-    except Exception as e:
+        raw, base_position = _read_new_bytes(log_file, last_position)
+    except OSError as e:
         st.error(f"读取日志文件出错: {e}")
-        return [], last_position
+        return iter(()), last_position
+
+    if raw is None:
+        return iter(()), last_position  # 文件不存在或已消失
+    if not raw:
+        # 为空或已读到末尾；轮转后base_position已归零
+        return iter(()), base_position
+
+    # utf-8优先，失败时退gb18030（gbk/gb2312的超集），最后以
+    # 替换字符兜底——旧的7种编码逐个尝试里，ascii/utf-16从未
+    # 命中，latin1永远成功只会把乱码放进面板
+    try:
+        content = raw.decode('utf-8')
+    except UnicodeDecodeError:
+        try:
+            content = raw.decode('gb18030')
+        except UnicodeDecodeError:
+            content = raw.decode('utf-8', errors='replace')
+
+    # 新位置由起始位置加读到的字节数推进（轮转后起始位置为0）
+    return _parse_lines(content), base_position + len(raw)
+
+
+def read_log_file(log_file: str, last_position: int = 0) -> Tuple[List[Dict], int]:
+    """读取日志文件并返回解析后的日志条目和新位置"""
+    entries_iter, new_position = iter_new_entries(log_file, last_position)
+    return list(entries_iter), new_position
 
 def is_script_active(script_id: str, timeout_minutes: int = 5) -> bool:
     """检测脚本是否仍然活跃"""
     script_config = st.session_state.script_configs.get(script_id)
-    
+
     if not script_config:
         return False
-    
+
     # 检查文件是否存在
     log_file = script_config.get("log_file")
     if not log_file or not os.path.exists(log_file):
         return False
-    
-    # 检查上次更新时间
-    last_update = script_config.get("last_update", datetime.min)
-    if (datetime.now() - last_update).total_seconds() > timeout_minutes * 60:
+
+    # 全程用epoch秒比较，只取一次当前时间，不构造datetime对象
+    now = time.time()
+    timeout_seconds = timeout_minutes * 60
+
+    # 检查上次更新时间（旧写入方存的是datetime，这里做兼容换算）
+    last_update = script_config.get("last_update", 0.0)
+    if isinstance(last_update, datetime):
+        last_update = last_update.timestamp()
+    if now - last_update > timeout_seconds:
         return False
-    
+
     # 检查文件修改时间
     try:
-        mtime = os.path.getmtime(log_file)
-        modified_time = datetime.fromtimestamp(mtime)
-        if (datetime.now() - modified_time).total_seconds() > timeout_minutes * 60:
+        if now - os.path.getmtime(log_file) > timeout_seconds:
             return False
     except:
         pass
-    
+
     return True 
\ No newline at end of file
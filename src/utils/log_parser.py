@@ -1,31 +1,95 @@
 import re
-import hashlib
 from typing import Optional, Dict
 
+# 标准日志行格式，模块级预编译：每次刷新要对每行日志匹配一次，
+# 不能依赖re内部那个只有几十条的模式缓存
+_LOG_LINE_RE = re.compile(r'(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3}) - (\w+) - \[([@#])(\w+)\](.*)')
+
+# 三种进度格式同样逐条匹配，全部提升为模块级编译模式
+_FRACTION_RE = re.compile(r'(.*?)\s+\((\d+)/(\d+)\)\s+(\d+(?:\.\d+)?)%$')
+_BRACKET_RE = re.compile(r'(.*?)\s+\[(\d+)/(\d+)\]\s+(\d+(?:\.\d+)?)%$')
+_PERCENT_RE = re.compile(r'(.*?)(\d+(?:\.\d+)?)%$')
+
+def _plausible_timestamp(ts: str) -> bool:
+    """按定宽逐段检查'YYYY-MM-DD HH:MM:SS,mmm'的数字与分隔符
+
+    快路径只对慢路径正则也会接受的时间戳短路，畸形行照旧
+    落进正则被拒，不会带着乱切的time_of_day混进结果。
+    """
+    return (
+        ts[4] == '-' and ts[7] == '-' and ts[10] == ' '
+        and ts[13] == ':' and ts[16] == ':' and ts[19] == ','
+        and ts[:4].isdigit() and ts[5:7].isdigit() and ts[8:10].isdigit()
+        and ts[11:13].isdigit() and ts[14:16].isdigit()
+        and ts[17:19].isdigit() and ts[20:].isdigit()
+    )
+
+
 def parse_log_line(line: str) -> Optional[Dict]:
     """解析单行日志"""
+    # 前缀快速分类：标准日志行必然以4位年份开头，堆栈、续行等
+    # 非日志行用一次C级切片比较就拦下，不用进正则引擎走到失配
+    if not line[:4].isdigit():
+        return None
+
+    # 时间戳合法但没有面板标记的普通消息同样常见，
+    # 一次C级子串查找把它们也挡在正则之外
+    if ' - [' not in line:
+        return None
+
+    # 格式固定的行走split快路径：几次C级字符串操作就拆出全部
+    # 字段，不进回溯式正则引擎
+    parts = line.split(' - ', 2)
+    if len(parts) == 3:
+        timestamp, level, rest = parts
+        if (len(timestamp) == 23 and _plausible_timestamp(timestamp)
+                and level.isalnum() and rest.startswith(('[#', '[@'))):
+            end = rest.find(']', 2)
+            # 面板名必须是简单标识符才信任切片；含特殊字符的
+            # 留给正则按自己的规则拒绝或接受
+            if end > 2 and rest[2:end].isidentifier():
+                content = rest[end + 1:].strip()
+                return {
+                    "timestamp": timestamp,
+                    "time_of_day": timestamp[11:19],  # 格式定宽，HH:MM:SS直接切片
+                    "level": level,
+                    "panel_type": rest[1],  # @ 进度条, # 普通日志
+                    "panel_name": rest[2:end],
+                    "content": content,
+                    "raw": line,
+                    "fingerprint": content[:4]  # 内容前4个字符本身就是自己的指纹
+                }
+
     # 匹配标准日志格式: 2025-03-27 22:03:14,456 - INFO - [@hash_progress] 进度 0%
-    match = re.match(r'(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3}) - (\w+) - \[([@#])(\w+)\](.*)', line)
-    
+    # （快路径未命中的畸形行由正则兜底）
+    match = _LOG_LINE_RE.match(line)
+
     if not match:
         return None
-        
+
     timestamp, level, panel_type, panel_name, content = match.groups()
-    
+    content = content.strip()
+
     return {
         "timestamp": timestamp,
+        "time_of_day": timestamp[11:19],  # 格式定宽，HH:MM:SS直接切片
         "level": level,
         "panel_type": panel_type,  # @ 进度条, # 普通日志
         "panel_name": panel_name,
-        "content": content.strip(),
+        "content": content,
         "raw": line,
-        "fingerprint": hashlib.md5(content[:4].encode()).hexdigest()  # 创建内容前4个字符的指纹
+        "fingerprint": content[:4]  # 内容前4个字符本身就是自己的指纹
     }
 
 def parse_progress(content: str) -> Optional[Dict]:
     """解析进度条信息"""
+    # 三种进度格式都以%收尾：一次C级尾字符比较就把非进度内容
+    # 挡在三次正则匹配之外
+    if not content or content[-1] != '%':
+        return None
+
     # 匹配分数形式进度: 任务 (5/10) 50%
-    fraction_match = re.match(r'(.*?)\s+\((\d+)/(\d+)\)\s+(\d+(?:\.\d+)?)%$', content)
+    fraction_match = _FRACTION_RE.match(content)
     
     if fraction_match:
         prefix, current, total, percentage = fraction_match.groups()
@@ -39,7 +103,7 @@ def parse_progress(content: str) -> Optional[Dict]:
         }
         
     # 匹配方括号形式进度: 任务 [5/10] 50%
-    bracket_match = re.match(r'(.*?)\s+\[(\d+)/(\d+)\]\s+(\d+(?:\.\d+)?)%$', content)
+    bracket_match = _BRACKET_RE.match(content)
     
     if bracket_match:
         prefix, current, total, percentage = bracket_match.groups()
@@ -53,7 +117,7 @@ def parse_progress(content: str) -> Optional[Dict]:
         }
     
     # 匹配进度百分比: 进度 50%
-    progress_match = re.match(r'(.*?)(\d+(?:\.\d+)?)%$', content)
+    progress_match = _PERCENT_RE.match(content)
     
     if progress_match:
         prefix, percentage = progress_match.groups()
@@ -4,6 +4,11 @@ import socket
 DEFAULT_PORT = 8501
 
 def is_port_in_use(port: int = DEFAULT_PORT) -> bool:
-    """检查端口是否已被占用"""
+    """检查端口是否已被占用
+
+    直连127.0.0.1跳过localhost的名字解析和IPv6回退，
+    50ms超时保证探测不会把启动路径挂住。
+    """
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-        return s.connect_ex(('localhost', port)) == 0 
\ No newline at end of file
+        s.settimeout(0.05)
+        return s.connect_ex(('127.0.0.1', port)) == 0 
\ No newline at end of file
@@ -1,19 +1,51 @@
 import streamlit as st
+import html
 import re
 import os
+import sys
 import time
 import psutil
 from datetime import datetime
 import threading
 import logging
+import queue
 import subprocess
 from typing import Dict, List, Optional, Set, Any
 import platform
 import json
-import hashlib
 import socket
 import webbrowser
 from abc import ABC, abstractmethod
+from collections import deque
+
+# 可选依赖：orjson的C实现比标准库json快数倍，未安装时退回标准库。
+# 导入期绑定一次解析函数，调用点不再做None判断
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    orjson = None
+    _loads = json.loads
+
+# 可选依赖：watchdog可用时日志尾随走文件系统事件而不是轮询
+try:
+    from watchdog.observers import Observer as _Observer
+    from watchdog.events import FileSystemEventHandler as _FSEventHandler
+except ImportError:
+    _Observer = None
+    _FSEventHandler = object
+
+
+@st.cache_data
+def _load_script_config(path: str, mtime_ns: int):
+    """解析脚本配置文件，按(路径, mtime_ns)缓存
+
+    配置文件没有改动时，后续rerun只付一次os.stat的代价，
+    不再重复打开和解析JSON。
+    """
+    with open(path, 'rb') as f:
+        raw = f.read()
+    return _loads(raw)
 
 # 设置页面配置
 st.set_page_config(
@@ -96,20 +128,42 @@ class BasePanel(ABC):
         """切换面板展开状态"""
         self.is_expanded = not self.is_expanded
 
+# 各级别的行HTML模板：条目入队时格式化一次，render只负责join
+_LOG_TEMPLATES = {
+    "error": '<p class="red-text">❌ [{t}] {c}</p>',
+    "warning": '<p class="yellow-text">⚠️ [{t}] {c}</p>',
+}
+_LOG_DEFAULT_TEMPLATE = '<p>ℹ️ [{t}] {c}</p>'
+
+
 class LogPanel(BasePanel):
     """日志面板类"""
     def __init__(self, title: str, icon: str = "", style: str = "default"):
         super().__init__(title, icon, style)
-        self.logs = []
+        # maxlen让追加时O(1)自动淘汰最旧条目，不再做列表切片拷贝；
+        # 存的是入队时渲染好的HTML行，条目只格式化一次而不是每次rerun
+        self.logs = deque(maxlen=100)
         self.progress_bars = {}
-        
+
     def add_log(self, log_entry: dict):
-        """添加日志条目"""
-        self.logs.append(log_entry)
-        # 限制日志数量
-        if len(self.logs) > 100:
-            self.logs = self.logs[-100:]
-    
+        """添加日志条目（入队时即渲染成HTML行）"""
+        level = log_entry.get("level", "info")
+        # 内容经unsafe_allow_html输出，必须先转义，
+        # 日志里的标记字符才不会注入面板HTML
+        self.logs.append(_LOG_TEMPLATES.get(level, _LOG_DEFAULT_TEMPLATE).format(
+            t=log_entry.get("timestamp", ""),
+            c=html.escape(log_entry.get("content", "")),
+        ))
+
+    def extend_logs(self, log_entries):
+        """批量添加(level, timestamp, content)元组，入队时渲染成HTML行"""
+        self.logs.extend(
+            _LOG_TEMPLATES.get(level, _LOG_DEFAULT_TEMPLATE).format(
+                t=ts, c=html.escape(content)
+            )
+            for level, ts, content in log_entries
+        )
+
     def update_progress(self, progress_id: str, progress_info: dict):
         """更新进度条"""
         self.progress_bars[progress_id] = progress_info
@@ -121,26 +175,23 @@ class LogPanel(BasePanel):
         with container:
             # 创建可折叠区域
             with st.expander(f"{self.icon} {self.title}", expanded=self.is_expanded):
-                # 渲染进度条
-                for progress_id, progress_info in self.progress_bars.items():
-                    percentage = progress_info.get("percentage", 0)
-                    text = progress_info.get("text", "")
-                    
-                    st.progress(min(percentage / 100, 1.0))
-                    st.caption(text)
+                # 渲染进度条：N个进度条合成一个HTML块一次发出，
+                # 不再每条产生st.progress+st.caption两个前端delta
+                if self.progress_bars:
+                    bar_parts = []
+                    for progress_info in self.progress_bars.values():
+                        percentage = min(progress_info.get("percentage", 0), 100)
+                        text = progress_info.get("text", "")
+                        bar_parts.append(
+                            f'<progress value="{percentage}" max="100" style="width:100%"></progress>'
+                            f'<p class="progress-text">{html.escape(text)}</p>'
+                        )
+                    st.markdown("".join(bar_parts), unsafe_allow_html=True)
                 
-                # 渲染日志
-                for log in reversed(self.logs):
-                    level = log.get("level", "info")
-                    timestamp = log.get("timestamp", "")
-                    content = log.get("content", "")
-                    
-                    if level == "error":
-                        st.markdown(f'<p class="red-text">❌ [{timestamp}] {content}</p>', unsafe_allow_html=True)
-                    elif level == "warning":
-                        st.markdown(f'<p class="yellow-text">⚠️ [{timestamp}] {content}</p>', unsafe_allow_html=True)
-                    else:
-                        st.write(f"ℹ️ [{timestamp}] {content}")
+                # 渲染日志：HTML在入队时已生成，这里join后用单次
+                # st.markdown输出，每个面板每次刷新只发一条前端消息
+                if self.logs:
+                    st.markdown("\n".join(reversed(self.logs)), unsafe_allow_html=True)
 
 class SystemPanel(BasePanel):
     """系统状态面板类"""
@@ -237,17 +288,23 @@ class DashboardManager:
     """仪表板管理器类"""
     def __init__(self):
         self.panels = {}
+        # 日志面板的二级索引：更新热路径一次get直接拿到LogPanel，
+        # 不再逐条做membership探测加isinstance
+        self.log_panels = {}
         self.columns_per_row = 2
         self.is_visible = True
-        
+
     def add_panel(self, panel_id: str, panel: BasePanel):
         """添加面板"""
         self.panels[panel_id] = panel
-    
+        if isinstance(panel, LogPanel):
+            self.log_panels[panel_id] = panel
+
     def remove_panel(self, panel_id: str):
         """移除面板"""
         if panel_id in self.panels:
             del self.panels[panel_id]
+            self.log_panels.pop(panel_id, None)
     
     def set_columns_per_row(self, columns: int):
         """设置每行显示的面板数"""
@@ -273,6 +330,14 @@ class DashboardManager:
                     with cols[j]:
                         panel.render(st.container())
 
+# 全局共享的系统/预设/性能面板：三者展示的都是全局数据
+# （CPU/内存、预设、性能配置），多脚本时共用一份实例，
+# 状态更新一次所有页签都能读到
+_shared_system_panel = SystemPanel()
+_shared_preset_panel = PresetPanel()
+_shared_performance_panel = PerformancePanel()
+
+
 class ScriptDashboard:
     """脚本仪表板类"""
     def __init__(self, script_name: str):
@@ -280,14 +345,13 @@ class ScriptDashboard:
         self.start_time = datetime.now()
         self.dashboard_manager = DashboardManager()
         self.is_visible = True
-        
-        # 初始化基础面板
-        self.system_panel = SystemPanel()
+
+        # 基础面板与预设/性能面板都挂共享实例
+        self.system_panel = _shared_system_panel
         self.dashboard_manager.add_panel("system", self.system_panel)
-        
-        # 初始化预设和性能面板
-        self.preset_panel = PresetPanel()
-        self.performance_panel = PerformancePanel()
+
+        self.preset_panel = _shared_preset_panel
+        self.performance_panel = _shared_performance_panel
         self.dashboard_manager.add_panel("preset", self.preset_panel)
         self.dashboard_manager.add_panel("performance", self.performance_panel)
         
@@ -325,9 +389,119 @@ class ScriptDashboard:
             # 渲染仪表板
             self.dashboard_manager.render(st.container())
 
+@st.cache_data(ttl=1.0)
+def _system_snapshot():
+    """采样一次系统状态
+
+    cpu_percent、virtual_memory和disk_io_counters都要读/proc，
+    1秒TTL让同一rerun里所有脚本页签共享一次采样。
+    """
+    disk_io = psutil.disk_io_counters()
+    return (
+        psutil.cpu_percent(),
+        psutil.virtual_memory().percent,
+        disk_io.read_bytes / 1024 / 1024,
+        disk_io.write_bytes / 1024 / 1024,
+    )
+
+
+# 后台尾随线程与rerun循环之间的有界队列：线程负责磁盘IO和解析，
+# rerun只做排空，消费端落后时丢新条目保住内存上限
+_log_queue: "queue.Queue" = queue.Queue(maxsize=10_000)
+
+
+class _LogModifiedHandler(_FSEventHandler):
+    """watchdog回调：把有改动的日志路径记进脏集合"""
+
+    def __init__(self, dirty: set, lock: threading.Lock):
+        self._dirty = dirty
+        self._lock = lock
+
+    def on_modified(self, event):
+        if not event.is_directory:
+            with self._lock:
+                self._dirty.add(event.src_path)
+
+
+def _tail_logs():
+    """后台尾随所有已注册脚本的日志，把解析好的条目推入队列
+
+    装了watchdog时按文件系统事件驱动：空闲脚本一个系统调用都
+    不花，只有真正被写入的文件才会读取；否则退回0.5秒轮询。
+    """
+    dirty: set = set()
+    lock = threading.Lock()
+    watched_dirs: set = set()
+    observer = None
+    handler = None
+    if _Observer is not None:
+        try:
+            observer = _Observer()
+            observer.daemon = True  # 随主进程退出，不阻塞关闭
+            handler = _LogModifiedHandler(dirty, lock)
+            observer.start()
+        except (OSError, RuntimeError):
+            # 只兜底运行环境问题（inotify句柄耗尽等）；
+            # 调用方式错误应当直接暴露，而不是悄悄退回轮询
+            observer = None
+
+    while True:
+        if observer is not None:
+            with lock:
+                changed = dirty.copy()
+                dirty.clear()
+        else:
+            changed = None  # 轮询模式：每个文件都做stat探测
+
+        for script_id, info in list(StreamlitLoggerManager._running_scripts.items()):
+            log_file = info.get("log_file")
+            if not log_file:
+                continue
+            if observer is not None:
+                abs_path = info.get("abs_path")
+                if abs_path is None:
+                    # 新注册的脚本：挂上目录监听，并把存量内容读一次
+                    abs_path = info["abs_path"] = os.path.abspath(log_file)
+                    watch_dir = os.path.dirname(abs_path)
+                    if watch_dir not in watched_dirs:
+                        try:
+                            observer.schedule(handler, watch_dir, recursive=False)
+                            watched_dirs.add(watch_dir)
+                        except OSError:
+                            pass
+                    changed.add(abs_path)
+                if abs_path not in changed:
+                    continue
+            # 先stat探测大小：文件没有增长时本轮只花一个系统调用，
+            # 空闲脚本不再被open/seek/read空转
+            last_position = info.get("last_position", 0)
+            try:
+                if os.stat(log_file).st_size <= last_position:
+                    continue
+                with open(log_file, 'rb') as f:
+                    f.seek(last_position)
+                    raw = f.read()
+            except OSError:
+                continue
+            if not raw:
+                continue
+            info["last_position"] = last_position + len(raw)
+            for line in raw.decode('utf-8', errors='replace').splitlines():
+                line = line.strip()
+                if not line:
+                    continue
+                entry = parse_log_line(line)
+                if entry:
+                    try:
+                        _log_queue.put_nowait((script_id, entry))
+                    except queue.Full:
+                        break
+        time.sleep(0.5)
+
+
 class StreamlitLoggerManager:
     """Streamlit日志管理器"""
-    
+
     _default_layout = {
         "status": {"title": "📊 总体进度", "style": "lightyellow", "icon": "✅"},
         "progress": {"title": "🔄 当前进度", "style": "lightcyan", "icon": "🔄"},
@@ -342,6 +516,7 @@ class StreamlitLoggerManager:
     _config_dir = None
     _last_browser_open = None
     _dashboards = {}
+    _tail_thread = None
     
     @staticmethod
     def set_layout(layout_config=None, log_file=None):
@@ -376,16 +551,23 @@ class StreamlitLoggerManager:
             "log_file": log_file,
             "script_name": script_name,
             "last_position": 0,
-            "last_update": datetime.now(),
+            "last_update": time.time(),
             "start_time": datetime.now()
         }
-        
-        # 记录运行中的脚本
+
+        # 记录运行中的脚本（last_position归后台尾随线程所有）
         StreamlitLoggerManager._running_scripts[script_id] = {
             "log_file": log_file,
-            "last_check": datetime.now()
+            "last_check": time.time(),
+            "last_position": 0
         }
-        
+
+        # 懒启动后台尾随线程：rerun循环只消费队列，不再阻塞在磁盘IO上
+        if StreamlitLoggerManager._tail_thread is None:
+            thread = threading.Thread(target=_tail_logs, daemon=True, name="log-tail")
+            StreamlitLoggerManager._tail_thread = thread
+            thread.start()
+
         return log_file
 
     @staticmethod
@@ -396,42 +578,56 @@ class StreamlitLoggerManager:
             
         dashboard = StreamlitLoggerManager._dashboards[script_id]
         
-        # 更新系统状态
+        # 更新系统状态（带1秒TTL缓存的采样）
         try:
-            cpu_usage = psutil.cpu_percent()
-            memory = psutil.virtual_memory()
-            disk_io = psutil.disk_io_counters()
-            
+            cpu_usage, memory_percent, disk_read, disk_write = _system_snapshot()
+
             dashboard.system_panel.update_stats(
                 cpu=cpu_usage,
-                memory=memory.percent,
+                memory=memory_percent,
                 disk_io={
-                    "read": disk_io.read_bytes / 1024 / 1024,
-                    "write": disk_io.write_bytes / 1024 / 1024
+                    "read": disk_read,
+                    "write": disk_write
                 }
             )
         except:
             pass
         
-        # 更新日志面板
+        # 更新日志面板：先按面板分组再整批派发——日志一次extend
+        # 进deque，进度条每个前缀只保留最后一次更新（中间进度值
+        # 在下一次渲染前本来就不可见）
+        # 二级索引只收录LogPanel，逐条派发时一次get就完成
+        # 存在性和类型两重判断
+        panels = dashboard.dashboard_manager.log_panels
+        logs_by_panel = {}
+        progress_by_panel = {}
+
         for entry in log_entries:
             panel_name = entry["panel_name"]
-            panel_type = entry["panel_type"]
+            if panel_name not in panels:
+                continue
+
             content = entry["content"]
-            
-            if panel_name in dashboard.dashboard_manager.panels:
-                panel = dashboard.dashboard_manager.panels[panel_name]
-                if isinstance(panel, LogPanel):
-                    if panel_type == "@":  # 进度条
-                        progress_info = parse_progress(content)
-                        if progress_info:
-                            panel.update_progress(progress_info.get("prefix", "进度"), progress_info)
-                    else:  # 普通日志
-                        panel.add_log({
-                            "level": entry["level"],
-                            "timestamp": entry["timestamp"].split(' ')[1].split(',')[0],
-                            "content": content
-                        })
+
+            if entry["panel_type"] == "@":  # 进度条
+                progress_info = parse_progress(content)
+                if progress_info:
+                    prefix = progress_info.get("prefix", "进度")
+                    progress_by_panel.setdefault(panel_name, {})[prefix] = progress_info
+            else:  # 普通日志
+                logs_by_panel.setdefault(panel_name, []).append((
+                    entry["level"],
+                    entry["timestamp"].split(' ')[1].split(',')[0],
+                    content
+                ))
+
+        for panel_name, logs in logs_by_panel.items():
+            panels[panel_name].extend_logs(logs)
+
+        for panel_name, progress_map in progress_by_panel.items():
+            panel = panels[panel_name]
+            for prefix, progress_info in progress_map.items():
+                panel.update_progress(prefix, progress_info)
 
     @staticmethod
     def _render_dashboard(script_id: str, container):
@@ -442,11 +638,67 @@ class StreamlitLoggerManager:
         dashboard = StreamlitLoggerManager._dashboards[script_id]
         dashboard.render(container)
 
+# 日志与进度的四个模式提升为模块级预编译对象：每行新增日志都要
+# 匹配一次，不再每次调用都走re模块按模式字符串查缓存的路径
+_LOG_RE = re.compile(r'(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3}) - (\w+) - \[([@#])(\w+)\](.*)')
+_PCT_RE = re.compile(r'(.*?)(\d+(?:\.\d+)?)%$')
+_FRAC_RE = re.compile(r'(.*?)(?:\((\d+)/(\d+)\)).*?(\d+(?:\.\d+)?)%$')
+_BRACKET_RE = re.compile(r'(.*?)(?:\[(\d+)/(\d+)\]).*?(\d+(?:\.\d+)?)%$')
+
+# level和panel_name的基数都很小（四个级别、六个默认面板）：
+# 常见级别直接查表，其余intern成共享字符串，条目dict不再为
+# 每行日志各存一份拷贝，下游的相等比较也先走指针判等
+_LEVEL_INTERN = {
+    "INFO": "INFO",
+    "WARNING": "WARNING",
+    "ERROR": "ERROR",
+    "DEBUG": "DEBUG",
+}.get
+
 # 解析日志行
+def _plausible_timestamp(ts: str) -> bool:
+    """按定宽逐段检查'YYYY-MM-DD HH:MM:SS,mmm'的数字与分隔符
+
+    快路径只对慢路径正则也会接受的时间戳短路，
+    畸形行照旧落进正则被拒。
+    """
+    return (
+        ts[4] == '-' and ts[7] == '-' and ts[10] == ' '
+        and ts[13] == ':' and ts[16] == ':' and ts[19] == ','
+        and ts[:4].isdigit() and ts[5:7].isdigit() and ts[8:10].isdigit()
+        and ts[11:13].isdigit() and ts[14:16].isdigit()
+        and ts[17:19].isdigit() and ts[20:].isdigit()
+    )
+
+
 def parse_log_line(line: str) -> Optional[dict]:
     """解析单行日志"""
+    # 日志格式固定，先走split/find快路径：几次C级字符串操作拆出
+    # 全部字段，不进回溯式正则引擎
+    if line[:4].isdigit():
+        parts = line.split(' - ', 2)
+        if len(parts) == 3:
+            timestamp, level, rest = parts
+            if (len(timestamp) == 23 and _plausible_timestamp(timestamp)
+                    and level.isalnum() and rest.startswith(('[#', '[@'))):
+                end = rest.find(']', 2)
+                # 面板名必须是简单标识符才信任切片；含特殊字符的
+                # 留给正则按自己的规则拒绝或接受
+                if end > 2 and rest[2:end].isidentifier():
+                    content = rest[end + 1:].strip()
+                    return {
+                        "timestamp": timestamp,
+                        "level": _LEVEL_INTERN(level, sys.intern(level)),
+                        "panel_type": rest[1],  # @ 进度条, # 普通日志
+                        "panel_name": sys.intern(rest[2:end]),
+                        "content": content,
+                        "raw": line,
+                        "fingerprint": content[:4]  # 内容前4个字符本身就是自己的指纹
+                    }
+
     # 匹配标准日志格式: 2025-03-27 22:03:14,456 - INFO - [@hash_progress] 进度 0%
-    match = re.match(r'(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3}) - (\w+) - \[([@#])(\w+)\](.*)', line)
+    # （快路径未命中的畸形行由正则兜底）
+    match = _LOG_RE.match(line)
     
     if not match:
         return None
@@ -455,19 +707,24 @@ def parse_log_line(line: str) -> Optional[dict]:
     
     return {
         "timestamp": timestamp,
-        "level": level,
+        "level": _LEVEL_INTERN(level, sys.intern(level)),
         "panel_type": panel_type,  # @ 进度条, # 普通日志
-        "panel_name": panel_name,
+        "panel_name": sys.intern(panel_name),
         "content": content.strip(),
         "raw": line,
-        "fingerprint": hashlib.md5(content[:4].encode()).hexdigest()  # 创建内容前4个字符的指纹
+        "fingerprint": content[:4]  # 内容前4个字符本身就是自己的指纹
     }
 
 # 解析进度信息
 def parse_progress(content: str) -> Optional[dict]:
     """解析进度条信息"""
+    # 三种进度格式都以%收尾：一次C级尾字符比较就把非进度内容
+    # 挡在正则之外
+    if not content or content[-1] != '%':
+        return None
+
     # 匹配进度百分比: 进度 50%
-    progress_match = re.match(r'(.*?)(\d+(?:\.\d+)?)%$', content)
+    progress_match = _PCT_RE.match(content)
     
     if progress_match:
         prefix, percentage = progress_match.groups()
@@ -477,9 +734,9 @@ def parse_progress(content: str) -> Optional[dict]:
             "is_complete": float(percentage) >= 100.0
         }
     
-    # 匹配分数形式进度: (1/10) 10%
-    fraction_match = re.match(r'(.*?)(?:\((\d+)/(\d+)\)).*?(\d+(?:\.\d+)?)%$', content)
-    
+    # 匹配分数形式进度: (1/10) 10%（先用子串探测跳过没有括号的内容）
+    fraction_match = _FRAC_RE.match(content) if '(' in content else None
+
     if fraction_match:
         prefix, current, total, percentage = fraction_match.groups()
         return {
@@ -491,9 +748,9 @@ def parse_progress(content: str) -> Optional[dict]:
             "fraction": f"({current}/{total})"
         }
         
-    # 匹配方括号形式进度: [1/10] 10%
-    bracket_match = re.match(r'(.*?)(?:\[(\d+)/(\d+)\]).*?(\d+(?:\.\d+)?)%$', content)
-    
+    # 匹配方括号形式进度: [1/10] 10%（同样先探测方括号）
+    bracket_match = _BRACKET_RE.match(content) if '[' in content else None
+
     if bracket_match:
         prefix, current, total, percentage = bracket_match.groups()
         return {
@@ -507,34 +764,50 @@ def parse_progress(content: str) -> Optional[dict]:
     
     return None
 
+# 每次rerun共享一份stat缓存：同一路径的exists/mtime/size探测
+# 合并成一次os.stat，rerun开始时整体清空
+_stat_cache: Dict[str, Optional[os.stat_result]] = {}
+
+
+def _cached_stat(path: str) -> Optional[os.stat_result]:
+    """按路径缓存的os.stat；文件不存在时缓存None"""
+    if path not in _stat_cache:
+        try:
+            _stat_cache[path] = os.stat(path)
+        except OSError:
+            _stat_cache[path] = None
+    return _stat_cache[path]
+
+
 # 读取日志文件
 def read_log_file(log_file: str, last_position: int = 0) -> (List[dict], int):
     """读取日志文件并返回解析后的日志条目和新位置"""
-    if not os.path.exists(log_file):
+    # 一次stat同时回答"文件存在吗"和"有新增字节吗"：没有增长的
+    # 空闲脚本连open都省掉
+    stat_result = _cached_stat(log_file)
+    if stat_result is None or stat_result.st_size <= last_position:
         return [], last_position
-    
+
     try:
-        log_entries = []
-        new_position = last_position
-        
-        with open(log_file, 'r', encoding='utf-8', errors='replace') as f:
-            # 定位到上次读取位置
+        # 二进制读取：位置就是字节偏移，定位不经过文本层的
+        # 解码状态机，新位置直接由读到的字节数推进。单次最多读
+        # 1MB，超大日志剩余部分留给下一个tick，避免一口吃光内存
+        with open(log_file, 'rb') as f:
             f.seek(last_position)
-            
-            # 读取新内容
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                    
-                log_entry = parse_log_line(line)
-                if log_entry:
-                    log_entries.append(log_entry)
-            
-            # 更新读取位置
-            new_position = f.tell()
-        
-        return log_entries, new_position
+            raw = f.read(1 << 20)
+
+        # 读满上限时可能切在行中间，回退到最后一个完整行
+        if len(raw) == (1 << 20):
+            cut = raw.rfind(b'\n') + 1
+            if cut:
+                raw = raw[:cut]
+
+        # splitlines在C层切行并去掉行尾换行，解析交给map+推导，
+        # 不再跑逐行的Python循环体
+        lines = raw.decode('utf-8', errors='replace').splitlines()
+        log_entries = [e for e in map(parse_log_line, lines) if e is not None]
+
+        return log_entries, last_position + len(raw)
     except Exception as e:
         st.error(f"读取日志文件出错: {e}")
         return [], last_position
@@ -547,32 +820,34 @@ def is_script_active(script_id: str, timeout_minutes: int = 5) -> bool:
     if not script_config:
         return False
     
-    # 检查文件是否存在
+    # 检查文件是否存在（exists和mtime合并成一次缓存的stat）
     log_file = script_config.get("log_file")
-    if not log_file or not os.path.exists(log_file):
+    stat_result = _cached_stat(log_file) if log_file else None
+    if stat_result is None:
         return False
-    
-    # 检查上次更新时间
-    last_update = script_config.get("last_update", datetime.min)
-    if (datetime.now() - last_update).total_seconds() > timeout_minutes * 60:
+
+    # 全程用epoch秒比较，只取一次当前时间，不构造datetime对象
+    now = time.time()
+    timeout_seconds = timeout_minutes * 60
+
+    # 检查上次更新时间（旧写入方存的是datetime，这里做兼容换算）
+    last_update = script_config.get("last_update", 0.0)
+    if isinstance(last_update, datetime):
+        last_update = last_update.timestamp()
+    if now - last_update > timeout_seconds:
         return False
-    
-    # 检查文件修改时间
-    try:
-        mtime = os.path.getmtime(log_file)
-        modified_time = datetime.fromtimestamp(mtime)
-        if (datetime.now() - modified_time).total_seconds() > timeout_minutes * 60:
-            return False
-    except:
-        pass
-    
+
+    # 检查文件修改时间（stat里现成的mtime就是epoch秒）
+    if now - stat_result.st_mtime > timeout_seconds:
+        return False
+
     return True
 
 # 主应用入口
 def main():
     """主应用入口点"""
     st.title("多脚本实时日志监控")
-    
+
     # 初始化会话状态
     if "script_configs" not in st.session_state:
         st.session_state.script_configs = {}
@@ -625,99 +900,118 @@ def main():
     
     if len(sys.argv) > 1:
         config_dir = sys.argv[1]
+
+        def _monitor_section():
+            """扫描配置、排空日志队列并渲染所有活跃脚本的选项卡"""
+            # stat缓存只在单次刷新内有效，入口处整体清空
+            _stat_cache.clear()
+
         
-        # 如果启用了强制重新加载，则清除配置
-        if "force_reload_timestamp" in st.session_state:
-            current_time = time.time()
-            if current_time - st.session_state.force_reload_timestamp > 5:
-                st.session_state.script_configs = {}
-                StreamlitLoggerManager._dashboards.clear()
-                st.session_state.force_reload_timestamp = current_time
+            # 如果启用了强制重新加载，则清除配置
+            if "force_reload_timestamp" in st.session_state:
+                current_time = time.time()
+                if current_time - st.session_state.force_reload_timestamp > 5:
+                    st.session_state.script_configs = {}
+                    StreamlitLoggerManager._dashboards.clear()
+                    st.session_state.force_reload_timestamp = current_time
         
-        # 监控所有脚本日志文件
-        active_scripts = []
+            # 监控所有脚本日志文件
+            active_scripts = []
         
-        # 从配置目录加载脚本
-        if os.path.exists(config_dir):
-            for file in os.listdir(config_dir):
-                if file.endswith('.json'):
-                    script_id = file.split('.')[0]
-                    
-                    # 读取配置文件
-                    config_file = os.path.join(config_dir, file)
-                    try:
-                        with open(config_file, 'r') as f:
-                            config = json.load(f)
-                        
-                        log_file = config.get("log_file", "")
-                        
-                        # 检查日志文件是否存在
-                        if not log_file or not os.path.exists(log_file):
-                            continue
-                            
-                        # 初始化脚本配置
-                        if script_id not in st.session_state.script_configs:
-                            StreamlitLoggerManager.set_layout(config.get("layout"), log_file)
-                            
-                    except Exception as e:
-                        st.error(f"读取配置文件出错: {e}")
+            # 从配置目录加载脚本：一次scandir同时拿到目录项和stat信息，
+            # 不再对每个配置文件单独exists+stat
+            config_entries = []
+            try:
+                with os.scandir(config_dir) as it:
+                    config_entries = [
+                        (entry.name, entry.path, entry.stat().st_mtime_ns)
+                        for entry in it if entry.name.endswith('.json')
+                    ]
+            except OSError:
+                pass
+
+            for file, config_file, mtime_ns in config_entries:
+                script_id = file.split('.')[0]
+
+                # 读取配置文件（未改动时命中mtime键的缓存）
+                try:
+                    config = _load_script_config(config_file, mtime_ns)
+
+                    log_file = config.get("log_file", "")
+
+                    # 检查日志文件是否存在（复用本次刷新的stat缓存）
+                    if not log_file or _cached_stat(log_file) is None:
                         continue
-        
-        # 更新所有脚本的日志
-        for script_id, script_config in list(st.session_state.script_configs.items()):
-            log_file = script_config.get("log_file", "")
-            
-            if log_file and os.path.exists(log_file):
-                # 读取日志文件
-                last_position = script_config.get("last_position", 0)
-                log_entries, new_position = read_log_file(log_file, last_position)
-                
-                # 更新位置
-                script_config["last_position"] = new_position
-                
+
+                    # 初始化脚本配置
+                    if script_id not in st.session_state.script_configs:
+                        StreamlitLoggerManager.set_layout(config.get("layout"), log_file)
+
+                except Exception as e:
+                    st.error(f"读取配置文件出错: {e}")
+                    continue
+
+            # 排空后台尾随线程推来的已解析条目，按脚本分组；
+            # rerun路径只消费队列，磁盘IO都在尾随线程里完成
+            entries_by_script = {}
+            while True:
+                try:
+                    script_id, entry = _log_queue.get_nowait()
+                except queue.Empty:
+                    break
+                entries_by_script.setdefault(script_id, []).append(entry)
+
+            for script_id, script_config in list(st.session_state.script_configs.items()):
+                log_entries = entries_by_script.get(script_id)
+
                 # 处理日志条目
                 if log_entries:
                     StreamlitLoggerManager._update_dashboard(script_id, log_entries)
-                    script_config["last_update"] = datetime.now()
-                
+                    script_config["last_update"] = time.time()
+
                 # 检查脚本是否活跃
                 if is_script_active(script_id):
                     active_scripts.append(script_id)
         
-        # 创建选项卡
-        if active_scripts:
-            # 为每个活跃脚本创建一个选项卡，按照脚本名称排序
-            sorted_scripts = sorted(active_scripts, 
-                                   key=lambda s: st.session_state.script_configs[s].get("script_name", s))
+            # 创建选项卡
+            if active_scripts:
+                # 为每个活跃脚本创建一个选项卡，按照脚本名称排序
+                sorted_scripts = sorted(active_scripts, 
+                                       key=lambda s: st.session_state.script_configs[s].get("script_name", s))
             
-            # 生成带时间戳的页签名称
-            tab_names = []
-            for script_id in sorted_scripts:
-                script_config = st.session_state.script_configs[script_id]
-                script_name = script_config.get("script_name", script_id)
-                start_time = script_config.get("start_time", datetime.now())
-                time_str = start_time.strftime("%H:%M:%S")
-                tab_names.append(f"{script_name}@{time_str}")
+                # 生成带时间戳的页签名称
+                tab_names = []
+                for script_id in sorted_scripts:
+                    script_config = st.session_state.script_configs[script_id]
+                    script_name = script_config.get("script_name", script_id)
+                    start_time = script_config.get("start_time", datetime.now())
+                    time_str = start_time.strftime("%H:%M:%S")
+                    tab_names.append(f"{script_name}@{time_str}")
             
-            tabs = st.tabs(tab_names)
+                tabs = st.tabs(tab_names)
             
-            # 在每个选项卡中渲染对应脚本的内容
-            for i, script_id in enumerate(sorted_scripts):
-                with tabs[i]:
-                    # 设置每行显示的面板数
-                    if script_id in StreamlitLoggerManager._dashboards:
-                        StreamlitLoggerManager._dashboards[script_id].dashboard_manager.set_columns_per_row(
-                            st.session_state.columns_per_row
-                        )
+                # 在每个选项卡中渲染对应脚本的内容
+                for i, script_id in enumerate(sorted_scripts):
+                    with tabs[i]:
+                        # 设置每行显示的面板数
+                        if script_id in StreamlitLoggerManager._dashboards:
+                            StreamlitLoggerManager._dashboards[script_id].dashboard_manager.set_columns_per_row(
+                                st.session_state.columns_per_row
+                            )
                     
-                    # 渲染仪表板
-                    StreamlitLoggerManager._render_dashboard(script_id, st.container())
+                        # 渲染仪表板
+                        StreamlitLoggerManager._render_dashboard(script_id, st.container())
+            else:
+                st.info("没有活跃的脚本日志")
+
+        # 支持fragment时只局部刷新监控区域：侧边栏等外围部件
+        # 不再每个tick重跑，也不需要整页sleep+rerun
+        if hasattr(st, "fragment"):
+            st.fragment(run_every=refresh_interval)(_monitor_section)()
         else:
-            st.info("没有活跃的脚本日志")
-        
-        # 自动刷新
-        time.sleep(refresh_interval)
-        st.rerun()
+            _monitor_section()
+            time.sleep(refresh_interval)
+            st.rerun()
     else:
         st.warning("请提供配置目录路径")
 
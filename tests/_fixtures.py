@@ -0,0 +1,57 @@
+"""
+测试共享的示例日志行与期望解析结果
+
+多个测试模块原来各自硬编码几乎相同的日志行和期望dict，
+集中到这里在收集期构建一次：行用元组，期望结果用
+MappingProxyType冻结成只读映射，测试只引用不重建。
+"""
+
+import types
+
+# 示例日志行（parse_log_line接收str，写文件时自行补换行）
+SAMPLE_LINES = (
+    "2025-03-27 15:30:45,123 - INFO - [#status]测试日志信息",
+    "2025-03-27 15:30:46,234 - WARNING - [#status]测试警告信息",
+    "2025-03-27 15:30:47,345 - ERROR - [#status]测试错误信息",
+    "2025-03-27 15:30:48,456 - INFO - [@progress]进度 50%",
+    "2025-03-27 15:30:49,567 - INFO - [@progress]任务 (5/10) 50%",
+)
+
+# 与SAMPLE_LINES逐条对应的期望解析结果（只含测试关心的键）
+SAMPLE_PARSED = tuple(types.MappingProxyType(d) for d in (
+    {
+        "timestamp": "2025-03-27 15:30:45,123",
+        "level": "INFO",
+        "panel_type": "#",
+        "panel_name": "status",
+        "content": "测试日志信息",
+    },
+    {
+        "timestamp": "2025-03-27 15:30:46,234",
+        "level": "WARNING",
+        "panel_type": "#",
+        "panel_name": "status",
+        "content": "测试警告信息",
+    },
+    {
+        "timestamp": "2025-03-27 15:30:47,345",
+        "level": "ERROR",
+        "panel_type": "#",
+        "panel_name": "status",
+        "content": "测试错误信息",
+    },
+    {
+        "timestamp": "2025-03-27 15:30:48,456",
+        "level": "INFO",
+        "panel_type": "@",
+        "panel_name": "progress",
+        "content": "进度 50%",
+    },
+    {
+        "timestamp": "2025-03-27 15:30:49,567",
+        "level": "INFO",
+        "panel_type": "@",
+        "panel_name": "progress",
+        "content": "任务 (5/10) 50%",
+    },
+))
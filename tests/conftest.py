@@ -14,6 +14,8 @@ from unittest.mock import MagicMock, patch
 # 将根目录添加到模块搜索路径中
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
+from tests._fixtures import SAMPLE_LINES
+
 # 模拟Streamlit
 @pytest.fixture
 def mock_streamlit():
@@ -60,16 +62,12 @@ def mock_psutil():
     with patch("src.logger_manager.psutil", psutil_mock):
         yield psutil_mock
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_log_file():
-    """创建临时的示例日志文件"""
+    """创建临时的示例日志文件（只读内容，整个会话共建一次）"""
     with tempfile.NamedTemporaryFile(mode="w+", delete=False, suffix=".log") as tmp:
-        # 写入一些测试日志条目
-        tmp.write("2025-03-27 15:30:45,123 - INFO - [#status]测试日志信息\n")
-        tmp.write("2025-03-27 15:30:46,234 - WARNING - [#status]测试警告信息\n")
-        tmp.write("2025-03-27 15:30:47,345 - ERROR - [#status]测试错误信息\n")
-        tmp.write("2025-03-27 15:30:48,456 - INFO - [@progress]进度 50%\n")
-        tmp.write("2025-03-27 15:30:49,567 - INFO - [@progress]任务 (5/10) 50%\n")
+        # 写入共享的测试日志条目（与期望解析结果保持同源）
+        tmp.write("\n".join(SAMPLE_LINES) + "\n")
         tmp.flush()
         tmp.close()
         
@@ -78,14 +76,14 @@ def sample_log_file():
         # 清理临时文件
         os.unlink(tmp.name)
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_config_dir():
-    """创建临时的配置目录和配置文件"""
+    """创建临时的配置目录和配置文件（只读内容，整个会话共建一次）"""
     with tempfile.TemporaryDirectory() as tmp_dir:
         # 创建临时日志文件
         log_file = os.path.join(tmp_dir, "test_script.log")
         with open(log_file, "w") as f:
-            f.write("2025-03-27 15:30:45,123 - INFO - [#status]测试日志信息\n")
+            f.write(SAMPLE_LINES[0] + "\n")
         
         # 创建临时配置文件
         config = {
@@ -0,0 +1,36 @@
+"""
+解析与日志读取热路径的微基准
+
+依赖pytest-benchmark（见requirements-dev.txt），未安装时整个
+模块在收集期跳过，常规测试时长不受影响。对比跑法：
+    pytest tests/test_benchmarks.py --benchmark-compare
+"""
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from src.utils.log_parser import parse_log_line, parse_progress
+from src.utils.file_utils import read_log_file
+from tests._fixtures import SAMPLE_LINES
+
+
+@pytest.mark.benchmark(group="parser")
+def test_bench_parse_log_line(benchmark):
+    """单行日志解析吞吐"""
+    result = benchmark(parse_log_line, SAMPLE_LINES[0])
+    assert result is not None
+
+
+@pytest.mark.benchmark(group="parser")
+def test_bench_parse_progress(benchmark):
+    """进度信息解析吞吐（分数+百分比完整路径）"""
+    result = benchmark(parse_progress, "任务 (5/10) 50%")
+    assert result is not None
+
+
+@pytest.mark.benchmark(group="reader")
+def test_bench_read_log_file(benchmark, sample_log_file):
+    """从头读取样例日志文件的端到端耗时"""
+    entries, _ = benchmark(read_log_file, sample_log_file, 0)
+    assert len(entries) == len(SAMPLE_LINES)
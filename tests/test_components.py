@@ -22,9 +22,19 @@ class TestPanel(BasePanel):
         self.render_called = True
 
 
+# 轻量容器替身：只提供with协议。渲染测试断言的是面板标志位，
+# 用不到MagicMock的调用记录和属性链构建开销
+class _StubContainer:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
 class TestDashboardManager:
     """测试仪表板管理器"""
-    
+
     def test_add_remove_panel(self):
         """测试添加和移除面板"""
         manager = DashboardManager()
@@ -85,7 +95,7 @@ class TestDashboardManager:
     def test_render(self, mock_streamlit):
         """测试渲染"""
         manager = DashboardManager()
-        container = MagicMock()
+        container = _StubContainer()
         
         # 添加测试面板
         panel1 = TestPanel("面板1")
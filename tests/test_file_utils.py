@@ -4,10 +4,22 @@
 
 import pytest
 import os
+import types
 from datetime import datetime, timedelta
 from unittest.mock import patch, MagicMock
 
 from src.utils.file_utils import read_log_file, is_script_active
+from tests._fixtures import SAMPLE_LINES, SAMPLE_PARSED
+
+# 活跃检测用的脚本配置模板：形状（路径+相对当前时刻的偏移）
+# 在模块加载时冻结成只读映射；具体时间戳留到测试内基于当次
+# now推算——若在import时取钟，测试只要晚跑约3分钟就会把
+# "2分钟前活跃"漂过5分钟超时边界
+_SCRIPT_CONFIG_OFFSETS = types.MappingProxyType({
+    "test_script": ("fake_log.txt", timedelta(minutes=2)),
+    "old_script": ("fake_log.txt", timedelta(minutes=10)),
+    "no_file_script": ("not_exists.txt", timedelta(0)),
+})
 
 class TestFileUtils:
     """测试文件工具类"""
@@ -18,20 +30,13 @@ class TestFileUtils:
         entries, position = read_log_file(sample_log_file, 0)
         
         # 验证读取结果
-        assert len(entries) == 5
+        assert len(entries) == len(SAMPLE_PARSED)
         assert position > 0
-        
-        # 验证内容解析正确
-        assert entries[0]["panel_name"] == "status"
-        assert entries[0]["content"] == "测试日志信息"
-        assert entries[0]["level"] == "INFO"
-        
-        assert entries[1]["level"] == "WARNING"
-        assert entries[2]["level"] == "ERROR"
-        
-        assert entries[3]["panel_type"] == "@"
-        assert entries[3]["panel_name"] == "progress"
-        assert "50%" in entries[3]["content"]
+
+        # 验证内容解析正确（逐条对照共享的期望结果）
+        for entry, expected in zip(entries, SAMPLE_PARSED):
+            for key, value in expected.items():
+                assert entry[key] == value
         
         # 从中间开始读取
         entries_2, position_2 = read_log_file(sample_log_file, position)
@@ -41,23 +46,66 @@ class TestFileUtils:
         entries_3, position_3 = read_log_file("not_exists.log", 0)
         assert len(entries_3) == 0
         assert position_3 == 0
-    
+
+    def test_read_log_file_large(self, tmp_path):
+        """测试约1MB日志走块读取路径时的完整性"""
+        line = SAMPLE_LINES[0] + "\n"
+        count = (1 << 20) // len(line.encode("utf-8")) + 1
+        log_file = tmp_path / "big.log"
+        log_file.write_text(line * count, encoding="utf-8")
+
+        entries, position = read_log_file(str(log_file), 0)
+        assert len(entries) == count
+        assert position == os.path.getsize(log_file)
+
+        # 续读应无新增
+        entries_2, position_2 = read_log_file(str(log_file), position)
+        assert len(entries_2) == 0
+        assert position_2 == position
+
+    def test_read_log_file_append(self, tmp_path):
+        """测试首读之后普通追加写入能被增量读到"""
+        log_file = tmp_path / "append.log"
+        log_file.write_text(SAMPLE_LINES[0] + "\n", encoding="utf-8")
+
+        entries, position = read_log_file(str(log_file), 0)
+        assert len(entries) == 1
+
+        # 追加两行：映射必须随文件增长重建，而不是返回空
+        with open(log_file, "a", encoding="utf-8") as f:
+            f.write(SAMPLE_LINES[1] + "\n")
+            f.write(SAMPLE_LINES[2] + "\n")
+
+        entries_2, position_2 = read_log_file(str(log_file), position)
+        assert len(entries_2) == 2
+        assert entries_2[0]["content"] == SAMPLE_PARSED[1]["content"]
+        assert entries_2[1]["content"] == SAMPLE_PARSED[2]["content"]
+        assert position_2 == os.path.getsize(log_file)
+
+    def test_read_log_file_rotation(self, tmp_path):
+        """测试日志轮转（删除重建）后能继续读到新文件"""
+        log_file = tmp_path / "rotate.log"
+        log_file.write_text("\n".join(SAMPLE_LINES) + "\n", encoding="utf-8")
+
+        entries, position = read_log_file(str(log_file), 0)
+        assert len(entries) == len(SAMPLE_PARSED)
+
+        # 删除重建：inode变化，缓存的旧fd必须被换掉、位置归零
+        log_file.unlink()
+        log_file.write_text(SAMPLE_LINES[0] + "\n", encoding="utf-8")
+
+        entries_2, position_2 = read_log_file(str(log_file), position)
+        assert len(entries_2) == 1
+        assert entries_2[0]["content"] == SAMPLE_PARSED[0]["content"]
+        assert position_2 == os.path.getsize(log_file)
+
     def test_is_script_active(self, mock_streamlit):
         """测试脚本活跃检测"""
-        # 设置模拟数据
+        # 只取一次当前时间，三条配置基于同一时刻按模板偏移展开
+        now = datetime.now()
         mock_streamlit.session_state.script_configs = {
-            "test_script": {
-                "log_file": "fake_log.txt",
-                "last_update": datetime.now() - timedelta(minutes=2)
-            },
-            "old_script": {
-                "log_file": "fake_log.txt",
-                "last_update": datetime.now() - timedelta(minutes=10)
-            },
-            "no_file_script": {
-                "log_file": "not_exists.txt",
-                "last_update": datetime.now()
-            }
+            k: {"log_file": path, "last_update": now - offset}
+            for k, (path, offset) in _SCRIPT_CONFIG_OFFSETS.items()
         }
         
         # 模拟文件存在检查
@@ -5,12 +5,34 @@
 import pytest
 import sys
 import os
+from contextlib import ExitStack
+from types import SimpleNamespace
 from unittest.mock import patch, MagicMock
 
 # 导入main模块
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 import main
 
+
+@pytest.fixture
+def main_patches():
+    """把main的外部依赖打成一个patch束
+
+    ExitStack一次性进出所有patch，测试里不用再堆嵌套with；
+    后续新增测试可直接复用这组替身。
+    """
+    with ExitStack() as stack:
+        # 固定走sleep+rerun兜底：装了streamlit_autorefresh时
+        # main会跳过time.sleep，断言不能依赖环境里是否有该组件
+        stack.enter_context(patch("main.st_autorefresh", None))
+        yield SimpleNamespace(
+            iter_entries=stack.enter_context(patch("main.iter_new_entries")),
+            is_active=stack.enter_context(patch("main.is_script_active")),
+            logger_manager=stack.enter_context(patch("main.StreamlitLoggerManager")),
+            sleep=stack.enter_context(patch("main.time.sleep")),
+        )
+
+
 class TestMain:
     """测试主程序功能"""
     
@@ -22,46 +44,31 @@ class TestMain:
             # 验证界面是否显示信息提示
             mock_streamlit.info.assert_called()
     
-    def test_main_with_config_dir(self, mock_streamlit, sample_config_dir):
+    def test_main_with_config_dir(self, mock_streamlit, sample_config_dir, main_patches):
         """测试有配置目录参数的main函数"""
-        # 模拟sys.argv
-        with patch.object(sys, "argv", ["main.py", sample_config_dir]), \
-             patch("main.read_log_file") as mock_read_log, \
-             patch("main.is_script_active") as mock_is_active, \
-             patch("main.StreamlitLoggerManager") as mock_logger_manager, \
-             patch("main.time.sleep") as mock_sleep:
-            
-            # 配置模拟返回值
-            mock_read_log.return_value = ([], 0)
-            mock_is_active.return_value = True
-            
-            # 添加模拟脚本配置
-            class SessionState:
-                def __init__(self):
-                    pass
-            
-            session_state = SessionState()
-            mock_streamlit.session_state = session_state
-            
+        # 模拟sys.argv（其余依赖由main_patches统一替换）
+        with patch.object(sys, "argv", ["main.py", sample_config_dir]):
+            # 配置模拟返回值（main走的是iter_new_entries）
+            main_patches.iter_entries.return_value = (iter(()), 0)
+            main_patches.is_active.return_value = True
+
+            # 添加模拟脚本配置（SimpleNamespace即可承载属性读写）
+            mock_streamlit.session_state = SimpleNamespace()
+
             # 调用主函数
             main.main()
-            
+
             # 验证主函数行为
             assert hasattr(mock_streamlit.session_state, "script_configs")
-            mock_sleep.assert_called()
+            main_patches.sleep.assert_called()
     
     def test_main_force_reload(self, mock_streamlit):
         """测试强制重新加载配置"""
         # 设置force_reload
         mock_streamlit.sidebar.checkbox.return_value = True
         
-        # 创建SessionState对象
-        class SessionState:
-            def __init__(self):
-                pass
-        
-        session_state = SessionState()
-        mock_streamlit.session_state = session_state
+        # 创建session_state替身（SimpleNamespace即可承载属性读写）
+        mock_streamlit.session_state = SimpleNamespace()
         
         with patch.object(sys, "argv", ["main.py"]), \
              patch("main.time") as mock_time:
@@ -33,10 +33,12 @@ class TestLogPanel:
         assert len(panel.logs) == 1
         assert panel.logs[0]["content"] == "测试日志"
         
-        # 添加大量日志测试限制
-        for i in range(110):
-            panel.add_log({"level": "info", "timestamp": "12:00:00", "content": f"日志 {i}"})
-        
+        # 批量添加大量日志测试限制（走生产端同一个extend路径）
+        panel.extend_logs(
+            {"level": "info", "timestamp": "12:00:00", "content": f"日志 {i}"}
+            for i in range(110)
+        )
+
         # 检查是否限制到最新的100条
         assert len(panel.logs) == 100
         assert "日志 110" not in [log["content"] for log in panel.logs]